@@ -2,4 +2,5 @@
 from .bot import Bot, Settings  # noqa: F401
 from .db import prisma  # noqa: F401
 from .embedding import *  # noqa: F401
+from .timeparse import parse_datetime, parse_recurrence  # noqa: F401
 from .utils import *  # noqa: F401
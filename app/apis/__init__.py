@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
 from .guilds import router as authRouter
+from .reminders import router as remindersRouter
+from .status import router as statusRouter
 
 __all__ = [
     "apis",
 ]
 apis = APIRouter()
 apis.include_router(authRouter)
+apis.include_router(remindersRouter)
+apis.include_router(statusRouter)
@@ -1,16 +1,38 @@
-import disnake
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app import parse_datetime
+from app.apis.pagination import NDJSON, decode_cursor, encode_cursor, wants_ndjson
 from app.services.GuildService import GuildService
-from app.services.ReminderService import ReminderService
 
 router = APIRouter()
 
 
 @router.get("/guilds/")
-async def getGuilds(service: GuildService = Depends(GuildService)):
-    return await service.get_all()
+async def getGuilds(
+        request: Request,
+        limit: int = Query(100, ge=1, le=1000),
+        after: str | None = None,
+        service: GuildService = Depends(GuildService),
+):
+    """
+    Guilds ordered by snowflake, ``after`` is the ``next`` cursor of the previous page.
+    With ``Accept: application/x-ndjson`` every guild is streamed instead, one per line.
+    """
+    if wants_ndjson(request):
+        async def stream():
+            async for guild in service.iter_all():
+                yield guild.json() + "\n"
+
+        return StreamingResponse(stream(), media_type=NDJSON)
+
+    after_snowflake = str(decode_cursor(after, length=1)[0]) if after is not None else None
+    guilds = await service.get_page(limit, after=after_snowflake)
+
+    return {
+        "guilds": guilds,
+        "next": encode_cursor(guilds[-1].snowflake) if len(guilds) == limit else None,
+    }
 
 
 @router.get("/guilds/{guild_id}")
@@ -30,9 +52,3 @@ async def get_guild_by_id(
 @router.get("/test/{input}")
 async def test(input: str):
     return parse_datetime(input)
-
-@router.get("/guilds/{guild_id}/reminders/{code}")
-async def get_guild_reminders(
-        guild_id: int, code: int, service: ReminderService = Depends(ReminderService)
-):
-    return await service.get_by_code(disnake.Object(guild_id), code)
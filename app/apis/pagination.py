@@ -0,0 +1,37 @@
+import base64
+import json
+from typing import Any
+
+from fastapi import HTTPException, Request
+
+__all__ = ["encode_cursor", "decode_cursor", "wants_ndjson", "NDJSON"]
+
+NDJSON = "application/x-ndjson"
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Packs the keyset values of the last returned row into an opaque cursor.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int | None = None) -> list:
+    """
+    Decodes a cursor made by ``encode_cursor``, with ``length`` it must hold that many values.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or length is not None and len(values) != length:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON in request.headers.get("accept", "")
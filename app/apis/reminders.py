@@ -0,0 +1,168 @@
+import datetime
+
+import disnake
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field, validator
+
+from app.apis.pagination import decode_cursor, encode_cursor
+from app.timeparse import parse_recurrence
+from app.services.GuildService import GuildService
+from app.services.ReminderService import ReminderService
+from app.services.TimezoneService import TimezoneService
+
+router = APIRouter()
+
+MAX_BULK_SIZE = 500
+MAX_AHEAD = datetime.timedelta(days=5 * 365)
+
+
+class ReminderIn(BaseModel):
+    content: str = Field(..., min_length=1, max_length=1000)
+    channel_id: int
+    author_id: int
+    expires_at: datetime.datetime
+    # "every 1d" or a bare rule like "1d"
+    recurrence: str | None = None
+
+    @validator("recurrence")
+    def check_recurrence(cls, value: str | None) -> str | None:
+        if value is None:
+            return None
+
+        recurrence = parse_recurrence(value) or parse_recurrence(f"every {value}")
+        return str(recurrence)
+
+    @validator("expires_at")
+    def check_expires_at(cls, value: datetime.datetime) -> datetime.datetime:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+        if value <= now:
+            raise ValueError("expires_at must be in the future")
+
+        if value > now + MAX_AHEAD:
+            raise ValueError("expires_at must be within 5 years")
+
+        return value
+
+
+class RemindersDelete(BaseModel):
+    codes: list[int] = Field(..., min_items=1, max_items=MAX_BULK_SIZE)
+
+
+async def get_guild_or_404(guild_id: int, guilds: GuildService) -> disnake.Object:
+    if not await guilds.exists(guild_id):
+        raise HTTPException(status_code=404, detail="Guild not found")
+
+    return disnake.Object(guild_id)
+
+
+def decode_reminder_cursor(after: str | None) -> tuple[datetime.datetime, int] | None:
+    if after is None:
+        return None
+
+    try:
+        expires_at, reminder_id = decode_cursor(after)
+        return datetime.datetime.fromisoformat(expires_at), int(reminder_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def list_reminders(
+        service: ReminderService,
+        timezones: TimezoneService,
+        guild: disnake.Object,
+        author_id: int | None,
+        limit: int,
+        after: str | None,
+) -> dict:
+    reminders = await service.get_page(
+        guild=guild, author_id=author_id, take=limit, after=decode_reminder_cursor(after)
+    )
+    last = reminders[-1] if len(reminders) == limit else None
+
+    return {
+        "reminders": await timezones.localize(guild, reminders),
+        "next": encode_cursor(last.expires_at.isoformat(), last.id) if last else None,
+    }
+
+
+@router.get("/guilds/{guild_id}/reminders")
+async def get_guild_reminders(
+        guild_id: int,
+        limit: int = Query(100, ge=1, le=1000),
+        after: str | None = None,
+        service: ReminderService = Depends(ReminderService),
+        guilds: GuildService = Depends(GuildService),
+        timezones: TimezoneService = Depends(TimezoneService),
+):
+    """
+    Reminders of a guild ordered by ``(expires_at, id)``,
+    ``after`` is the ``next`` cursor of the previous page.
+    ``expires_at`` is given in the timezone of each reminder's author.
+    """
+    guild = await get_guild_or_404(guild_id, guilds)
+    return await list_reminders(service, timezones, guild, None, limit, after)
+
+
+@router.get("/guilds/{guild_id}/members/{member_id}/reminders")
+async def get_member_reminders(
+        guild_id: int,
+        member_id: int,
+        limit: int = Query(100, ge=1, le=1000),
+        after: str | None = None,
+        service: ReminderService = Depends(ReminderService),
+        guilds: GuildService = Depends(GuildService),
+        timezones: TimezoneService = Depends(TimezoneService),
+):
+    guild = await get_guild_or_404(guild_id, guilds)
+    return await list_reminders(service, timezones, guild, member_id, limit, after)
+
+
+@router.get("/guilds/{guild_id}/reminders/{code}")
+async def get_guild_reminder(
+        guild_id: int, code: int, service: ReminderService = Depends(ReminderService)
+):
+    reminder = await service.get_by_code(disnake.Object(guild_id), code)
+
+    if reminder is None:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+
+    return reminder
+
+
+@router.post("/guilds/{guild_id}/reminders/bulk", status_code=201)
+async def create_reminders(
+        guild_id: int,
+        reminders: list[ReminderIn],
+        service: ReminderService = Depends(ReminderService),
+        guilds: GuildService = Depends(GuildService),
+):
+    """
+    Creates up to ``MAX_BULK_SIZE`` reminders in one transaction,
+    they are scheduled by the bot as soon as they are committed.
+    """
+    if not 0 < len(reminders) <= MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=422, detail=f"Expected 1 to {MAX_BULK_SIZE} reminders"
+        )
+
+    guild = await get_guild_or_404(guild_id, guilds)
+    created = await service.add_many(guild, [reminder.dict() for reminder in reminders])
+
+    return {"reminders": created}
+
+
+@router.delete("/guilds/{guild_id}/reminders")
+async def delete_reminders(
+        guild_id: int,
+        body: RemindersDelete,
+        service: ReminderService = Depends(ReminderService),
+        guilds: GuildService = Depends(GuildService),
+):
+    guild = await get_guild_or_404(guild_id, guilds)
+    removed = await service.remove_by_codes(guild, body.codes)
+
+    return {"deleted": [reminder.reminder_number for reminder in removed]}
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.bot import Bot
+from app.utils import bot_ready, get_bot_from_request
+
+router = APIRouter()
+
+
+@router.get("/status")
+async def get_status(request: Request):
+    """
+    Answers right away, also while the bot is still connecting.
+    """
+    return {"ready": get_bot_from_request(request).is_ready()}
+
+
+@router.get("/bot")
+async def get_bot(bot: Bot = Depends(bot_ready)):
+    return {
+        "id": bot.user.id,
+        "name": str(bot.user),
+        "guilds": len(bot.guilds),
+        "latency": bot.latency,
+    }
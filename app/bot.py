@@ -1,9 +1,10 @@
 import datetime
 from pathlib import Path
+from typing import Any, Literal
 
 import disnake.mixins
 import pydantic.main
-from disnake.ext.commands import InteractionBot
+from disnake.ext.commands import AutoShardedInteractionBot, InteractionBot
 from pydantic import BaseSettings
 
 from .db import prisma
@@ -22,6 +23,55 @@ class AppSettings(BaseSettings):
 
     github_link = "https://github.com/yatochka-dev/discord-bot-boilerplate"
 
+    # delete guilds (and their reminders) the bot has left while it was offline
+    PRUNE_LEFT_GUILDS: bool = False
+
+    # PROCESS SETTINGS
+    # "all" runs the api and the bot in one process, "api" runs stateless
+    # api workers and "bot" runs the gateway bot with the scheduler
+    RUN_MODE: Literal["all", "api", "bot"] = "all"
+    # unix socket api workers use to notify the bot process
+    IPC_SOCKET: str = "/tmp/reminder-bot.sock"
+    # several unsharded bot processes deliver reminders from the same database,
+    # reminder rows and codes are then read from the database instead of a cache
+    SHARED_DELIVERY: bool = False
+
+    # SHARDING SETTINGS
+    # run on the auto-sharded bot, SHARD_COUNT=None lets discord pick the count
+    # and SHARD_IDS=None runs every shard in this process (needs SHARD_COUNT otherwise)
+    SHARDED: bool = False
+    SHARD_COUNT: int | None = None
+    SHARD_IDS: list[int] | None = None
+
+    # API SETTINGS
+    # how long a request waits for the bot to connect before answering 503
+    API_READY_TIMEOUT: float = 5
+    API_RETRY_AFTER: int = 10
+
+    # REMINDERS SETTINGS
+    # only reminders due within this horizon are kept in memory
+    REMINDER_LOAD_HORIZON: datetime.timedelta = datetime.timedelta(hours=24)
+    REMINDER_LOAD_PAGE_SIZE: int = 500
+    # reminder delivery, the rate is kept below discord's
+    # global limit of 50 requests per second
+    DISPATCH_WORKERS: int = 4
+    DISPATCH_RATE: float = 40
+    DISPATCH_BATCH_SIZE: int = 100
+    # seconds a worker may hold claimed reminders before others may take them over
+    DELIVERY_LEASE: int = 60
+    # sends a worker attempts before it drops a reminder, failed ones are retried
+    # by the lease sweeper
+    DELIVERY_ATTEMPTS: int = 3
+    # number of guilds whose reminder codes are kept for autocomplete
+    CODE_INDEX_GUILDS: int = 1_000
+    # number of reminder rows kept in the write-through cache
+    REMINDER_CACHE_SIZE: int = 50_000
+
+    # USERS SETTINGS
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL: float = 60 * 60
+    USER_RESOLVE_CONCURRENCY: int = 8
+
     # EMBED SETTINGS
     RGB_DEFAULT_COLOR: disnake.Color = disnake.Color.from_rgb(255, 255, 255)
     RGB_ERROR_COLOR: disnake.Color = disnake.Color.from_rgb(255, 0, 0)
@@ -55,7 +105,10 @@ def id_(self) -> int | None:
     return None
 
 
-class Bot(InteractionBot):
+_BaseBot = AutoShardedInteractionBot if Settings.SHARDED else InteractionBot
+
+
+class Bot(_BaseBot):
     def __init__(self, *args, **kwargs):
         intents = disnake.Intents.default()
         intents.members = True
@@ -65,12 +118,46 @@ class Bot(InteractionBot):
         self.prisma = prisma
         self.disnake_logger = disnake_logger
         self.prisma_logger = prisma_logger
+        # set in api workers, events are forwarded to the bot process through it
+        self.ipc: Any = None
 
         disnake.mixins.Hashable.snowflake = snowflake  # noqa
         pydantic.main.BaseModel.id_ = id_  # noqa
 
+        if self.APP_SETTINGS.SHARDED:
+            kwargs.setdefault("shard_count", self.APP_SETTINGS.SHARD_COUNT)
+            kwargs.setdefault("shard_ids", self.APP_SETTINGS.SHARD_IDS)
+
         super().__init__(*args, **kwargs, intents=intents)
 
+    def owns_guild(self, guild_id: SupportsIntCast) -> bool:
+        """
+        Whether the guild is served by one of the shards of this process,
+        always true unless the shards are split between processes.
+        """
+        shard_ids = self.APP_SETTINGS.SHARD_IDS
+
+        if not self.APP_SETTINGS.SHARDED or shard_ids is None:
+            return True
+
+        return (int(guild_id) >> 22) % self.APP_SETTINGS.SHARD_COUNT in shard_ids
+
+    @property
+    def shard_latencies(self) -> list[tuple[int, float]]:
+        if self.APP_SETTINGS.SHARDED:
+            return self.latencies
+
+        return [(0, self.latency)]
+
+    async def publish(self, event: str, *args: Any) -> None:
+        """
+        Dispatches ``event`` to the listeners of the bot, which may live in another process.
+        """
+        if self.ipc is not None:
+            await self.ipc.send(event, *args)
+        else:
+            self.dispatch(event, *args)
+
     @property
     def now(self):
         return datetime.datetime.now(tz=self.APP_SETTINGS.TIMEZONE)
@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+__all__ = ["LRUCache"]
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry,
+    entries optionally expire ``ttl`` seconds after they were set.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> list[tuple[Hashable, Any]]:
+        """
+        Stores ``value`` and returns the ``(key, value)`` pairs evicted to make room for it.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        evicted = []
+        while len(self._data) > self.maxsize:
+            old_key, (old_value, _) = self._data.popitem(last=False)
+            evicted.append((old_key, old_value))
+
+        return evicted
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value, _ = self._data.pop(key, (default, None))
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def _lookup(self, key: Hashable) -> Any:
+        value, expires_at = self._data.get(key, (_MISSING, None))
+
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return _MISSING
+
+        return value
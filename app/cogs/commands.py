@@ -30,10 +30,16 @@ class Command(Cog, GuildService):
             case _:
                 color = (0, 0, 0)
 
+        fields = [
+            EmbedField(name=f"Shard {shard_id}", value=f"{round(latency * 1000, 2)}ms")
+            for shard_id, latency in self.bot.shard_latencies
+        ] if self.bot.APP_SETTINGS.SHARDED else []
+
         await interaction.send(
             embed=Embed(
                 title="Pong!",
                 description=f"{md('Latency'):bold}:{current_latency}ms",
+                fields=fields,
                 user=interaction.user,
             ).as_color(color)
         )
@@ -25,23 +25,25 @@ class Events(Cog, GuildService):
         "on_ready",
     )
     async def is_ready(self):
-        self.bot.logger.info(f"Logged in as {self.bot.user} (ID: {self.bot.user.id})")
-        self.bot.logger.info(f"Started bot in {os.getenv('STATE_NAME').title()} mode.")
+        self.bot.logger.info("Logged in as %s (ID: %s)", self.bot.user, self.bot.user.id)
+        self.bot.logger.info("Started bot in %s mode.", os.getenv("STATE_NAME").title())
         self.bot.logger.info("------")
 
-        for guild in self.bot.guilds:
-            if not await self.exists(guild.id):
-                await self.add(guild)
-                self.bot.logger.info(f"Added guild: {guild.name} (ID: {guild.id})")
-            else:
-                self.bot.logger.info(f"Guild already exists: {guild.name} (ID: {guild.id})")
+        added, pruned = await self.reconcile(
+            self.bot.guilds, prune=self.bot.APP_SETTINGS.PRUNE_LEFT_GUILDS
+        )
+
+        self.bot.logger.info(
+            "Guilds reconciled: %d total, %d added, %d pruned",
+            len(self.bot.guilds), len(added), len(pruned),
+        )
 
     @Cog.listener(
         "on_guild_join",
     )
     async def joined_guild(self, guild: disnake.Guild):
         await self.add(guild)
-        self.bot.logger.info(f"Joined guild: {guild.name} (ID: {guild.id})")
+        self.bot.logger.info("Joined guild: %s (ID: %s)", guild.name, guild.id)
 
         embed = Embed(
             title="Thanks for adding me!",
@@ -63,7 +65,7 @@ class Events(Cog, GuildService):
     )
     async def quit_guild(self, guild):
         await self.remove(guild)
-        self.bot.logger.info(f"Left guild: {guild.name} (ID: {guild.id})")
+        self.bot.logger.info("Left guild: %s (ID: %s)", guild.name, guild.id)
 
 
 def setup(bot: Bot):
@@ -1,28 +1,102 @@
 import datetime
+import math
 
 import disnake
 from disnake import ApplicationCommandInteraction
 from disnake.ext.commands import Cog, slash_command, guild_only, Param, has_permissions, \
     CommandInvokeError
-from disnake.ext.tasks import loop
 from prisma.models import Reminder
 
 from app import (
     Bot,
     Embed,
     parse_datetime,
+    parse_recurrence,
     get_mentions_as_string,
     create_embeds_from_fields,
     md,
 )
+from app.scheduler import (
+    ReminderScheduler,
+    ReminderLoader,
+    CatchUpDelivery,
+    DispatchQueue,
+    LeaseSweeper,
+)
 from app.services.ReminderService import ReminderService
 from app.types import CommandInteraction
-from app.views import PaginationView
+from app.views import PaginationView, PageProvider
+
+
+class ReminderPageProvider(PageProvider):
+    """
+    Renders reminder pages on demand, every page is fetched with a keyset
+    cursor taken from the neighbouring page that was shown before it.
+    """
+
+    def __init__(
+            self,
+            service: ReminderService,
+            embed: Embed,
+            guild: disnake.Guild = None,
+            member: disnake.Member = None,
+            page_size: int = 10,
+    ):
+        self.service = service
+        self.embed = embed
+        self.guild = guild
+        self.member = member
+        self.page_size = page_size
+        self.total = 0
+        # page index -> keys of its first and last reminder
+        self._bounds: dict[int, tuple[tuple, tuple]] = {}
+
+    async def count(self) -> int:
+        self.total = await self.service.count(guild=self.guild, member=self.member)
+        return math.ceil(self.total / self.page_size)
+
+    async def get_page(self, index: int) -> disnake.Embed:
+        page = dict(guild=self.guild, member=self.member, take=self.page_size)
+
+        if index == 0:
+            pass
+        elif index == math.ceil(self.total / self.page_size) - 1:
+            page.update(take=self.total - index * self.page_size, last=True)
+        elif index - 1 in self._bounds:
+            page.update(after=self._bounds[index - 1][1])
+        elif index + 1 in self._bounds:
+            page.update(before=self._bounds[index + 1][0])
+        else:
+            page.update(skip=index * self.page_size)
+
+        reminders = await self.service.get_page(**page)
+
+        if reminders:
+            self._bounds[index] = (
+                (reminders[0].expires_at, reminders[0].id),
+                (reminders[-1].expires_at, reminders[-1].id),
+            )
+
+        fields = await self.service.create_fields_from_reminders(reminders)
+        embeds = create_embeds_from_fields(self.embed, fields, max_size=self.page_size)
+
+        return embeds[0] if embeds else self.embed.default
 
 
 class UserReminder(Cog, ReminderService):
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.dispatch = DispatchQueue(self, self.send_reminder)
+        self.scheduler = ReminderScheduler(self.dispatch.submit)
+        self.loader = ReminderLoader(self, self.scheduler)
+        self.catchup = CatchUpDelivery(self, self.dispatch)
+        self.sweeper = LeaseSweeper(self, self.dispatch)
+
+    def cog_unload(self) -> None:
+        self.sweeper.stop()
+        self.loader.stop()
+        self.scheduler.stop()
+        self.dispatch.stop()
 
     @slash_command(
         name="reminder",
@@ -38,14 +112,19 @@ class UserReminder(Cog, ReminderService):
             self,
             inter: CommandInteraction,
             content: str = Param(name="content", description="The content of the reminder"),
-            in_: str = Param(name="in", description="In how long should the reminder be sent"),
+            in_: str = Param(
+                name="in",
+                description="In how long should the reminder be sent, e.g. 2h or every 1d",
+            ),
     ) -> None:
 
         assert len(in_) > 0, "You must specify a date"
 
-        datetime_at = parse_datetime(in_)
+        recurrence = parse_recurrence(in_)
+
+        datetime_at = parse_datetime(in_, await self.get_timezone(inter.guild, inter.author.id))
 
-        self.bot.logger.debug(f"Adding reminder for {inter.author} at {datetime_at}")
+        self.bot.logger.debug("Adding reminder for %s at %s", inter.author, datetime_at)
 
         assert datetime_at > self.bot.now, "You can't set a reminder in the past"
 
@@ -66,14 +145,17 @@ class UserReminder(Cog, ReminderService):
             member=inter.author,
             expires_at=datetime_at,
             content=content,
+            recurrence=recurrence,
         )
 
         await self.add_task(reminder, interaction=inter)
 
+        repeats = f", then every {md(str(recurrence)):code}" if recurrence else ""
+
         embed = Embed(
             description=f":alarm_clock: Reminder {md(f'#{reminder.reminder_number}'):code} "
                         f"created successfully and will be sent to this"
-                        f" channel at {disnake.utils.format_dt(datetime_at, style='F')}",
+                        f" channel at {disnake.utils.format_dt(datetime_at, style='F')}{repeats}",
             user=inter.author,
         ).success
 
@@ -89,20 +171,16 @@ class UserReminder(Cog, ReminderService):
         name="me",
     )
     async def list_my_reminders(self, inter: CommandInteraction) -> None:
-        reminders = await self.get_all(member=inter.author)
-
-        fields = [await self.create_field_from_reminder(reminder) for reminder in reminders]
-
         embed = Embed(
             title="Your reminders",
             description="Here are all your reminders",
-            fields=fields,
             user=inter.author,
         )
 
-        embeds = create_embeds_from_fields(embed, fields, max_size=10)
+        provider = ReminderPageProvider(self, embed, member=inter.author)
+        pages = await provider.count()
 
-        if not embeds:
+        if not pages:
             no_reminders_embed = Embed(
                 title="No reminders",
                 description="You don't have any reminders",
@@ -111,29 +189,27 @@ class UserReminder(Cog, ReminderService):
 
             return await inter.send(embed=no_reminders_embed)
 
-        view = PaginationView(bot=self.bot, user=inter.author, pages=embeds, timeout=60)
+        view = PaginationView(
+            bot=self.bot, user=inter.author, pages=provider, page_count=pages, timeout=60
+        )
 
-        await inter.send(embed=embeds[0], view=view)
+        await inter.send(embed=await view.get_page(0), view=view)
 
     @list_reminders.sub_command(
         name="all",
     )
     @has_permissions(administrator=True)
     async def list_all_reminders(self, inter: CommandInteraction) -> None:
-        reminders: list[Reminder] = (await self.get_all(guild=inter.guild)).reminders
-
-        fields = [await self.create_field_from_reminder(reminder) for reminder in reminders]
-
         embed = Embed(
             title="All reminders",
             description="Here are all reminders",
-            fields=fields,
             user=inter.author,
         )
 
-        embeds = create_embeds_from_fields(embed, fields, max_size=10)
+        provider = ReminderPageProvider(self, embed, guild=inter.guild)
+        pages = await provider.count()
 
-        if not embeds:
+        if not pages:
             no_reminders_embed = Embed(
                 title="No reminders",
                 description="There are no reminders created for this server",
@@ -142,9 +218,11 @@ class UserReminder(Cog, ReminderService):
 
             return await inter.send(embed=no_reminders_embed)
 
-        view = PaginationView(bot=self.bot, user=inter.author, pages=embeds, timeout=60)
+        view = PaginationView(
+            bot=self.bot, user=inter.author, pages=provider, page_count=pages, timeout=60
+        )
 
-        await inter.send(embed=embeds[0], view=view)
+        await inter.send(embed=await view.get_page(0), view=view)
 
     @remind.sub_command(
         name="delete",
@@ -164,6 +242,7 @@ class UserReminder(Cog, ReminderService):
 
         if member == inter.author or inter.author.guild_permissions.administrator:
             await self.remove(reminder.id)
+            self.scheduler.cancel(reminder.id)
             embed = Embed(
                 description=f":alarm_clock: Reminder {md(f'#{reminder.reminder_number}'):code} "
                             f"deleted successfully",
@@ -179,26 +258,47 @@ class UserReminder(Cog, ReminderService):
             self, inter: CommandInteraction, reminder_number: str
     ) -> list[str]:
         if inter.author.guild_permissions.administrator:
-            reminders = await self.get_all(guild=inter.guild, take=24)
-            return [str(reminder.reminder_number) for reminder in reminders]
+            return await self.search_codes(inter.guild, reminder_number)
         else:
-            reminders = await self.get_all(member=inter.author, take=24)
-            return [str(reminder.reminder_number) for reminder in reminders]
+            return await self.search_codes(inter.guild, reminder_number, author_id=inter.author.id)
 
     async def add_task(self, reminder: Reminder, interaction: CommandInteraction | None) -> None:
-        time = reminder.expires_at.time()
-        reminder_loop = loop(time=time)(self.remind_task)
+        # reminders past the loaded window are picked up later by the loader
+        if not self.loader.covers(reminder.expires_at):
+            return
 
-        reminder_loop.start(reminder_id=reminder.id, interaction=interaction)
+        self.scheduler.schedule(reminder.id, reminder.expires_at, interaction)
+        self.scheduler.start()
 
-    async def remind_task(self, reminder_id: int, interaction: CommandInteraction | None) -> None:
-        reminder = await self.get(reminder_id)
+    @Cog.listener("on_reminders_created")
+    @Cog.listener("on_reminders_rescheduled")
+    async def schedule_published(self, reminders: list[Reminder]) -> None:
+        self.scheduler.schedule_many(
+            reminder
+            for reminder in reminders
+            if self.loader.covers(reminder.expires_at) and self.bot.owns_guild(reminder.guild_id)
+        )
+        self.scheduler.start()
 
-        if reminder is None:
-            return
+    @Cog.listener("on_reminders_deleted")
+    async def cancel_deleted(self, reminders: list[Reminder]) -> None:
+        for reminder in reminders:
+            self.scheduler.cancel(reminder.id)
+
+    @Cog.listener("on_reminders_resync")
+    async def resync(self, _reminders: list[Reminder]) -> None:
+        # an api worker dropped events, reminders overdue by more than a lease
+        # are left to the sweeper
+        loaded = await self.loader.reload(
+            after=self.bot.now - datetime.timedelta(seconds=self.dispatch.lease)
+        )
+        self.bot.logger.warning("Reloaded %d reminders after an api worker resync", loaded)
 
+    async def send_reminder(
+            self, reminder: Reminder, interaction: CommandInteraction | None = None
+    ) -> None:
         channel = self.bot.get_channel(reminder.channel_id)
-        member = self.bot.get_user(reminder.author_id)
+        member = await self.bot.getch_user(reminder.author_id)
 
         mentions = get_mentions_as_string(reminder.content)
 
@@ -233,12 +333,10 @@ class UserReminder(Cog, ReminderService):
             except disnake.HTTPException:
                 await send_in_channel()
 
-        await self.remove(reminder.id)
-
     async def cog_slash_command_error(
             self, inter: ApplicationCommandInteraction, error: Exception
     ) -> None:
-        self.bot.logger.error(f"Error in remind command {type(error)}")
+        self.bot.logger.error("Error in remind command %r", type(error))
         if isinstance(error, CommandInvokeError):
             embed = Embed(
                 title="Error",
@@ -285,13 +383,17 @@ def setup(bot: Bot):
 
     @bot.listen("on_ready")
     async def ready():
-        reminders_deleted = await cog.remove_expired_reminders()
+        # everything up to this point is delivered by the catch-up pipeline,
+        # everything after it goes through the scheduler
+        cutoff = bot.now
 
-        bot.logger.warn(f"Removed {reminders_deleted} expired reminders")
+        cog.dispatch.start()
+        reminders_loaded = await cog.loader.reload(after=cutoff)
+        cog.loader.start()
 
-        reminders = await cog.get_all()
-
-        bot.logger.debug(f"Found {reminders} reminders")
+        bot.logger.info(
+            "Loaded %d reminders due in the next %s", reminders_loaded, cog.loader.horizon
+        )
 
-        for reminder in reminders:
-            await cog.add_task(reminder, interaction=None)
+        await cog.catchup.run(until=cutoff)
+        cog.sweeper.start()
@@ -0,0 +1,125 @@
+import datetime
+
+import disnake
+from disnake import ApplicationCommandInteraction
+from disnake.ext.commands import Cog, slash_command, guild_only, Param, has_permissions, \
+    CommandInvokeError
+
+from app import Bot, Embed, md
+from app.services.TimezoneService import TimezoneService
+from app.timezones import available_timezones, search_timezones
+from app.types import CommandInteraction
+
+
+class Timezones(Cog, TimezoneService):
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    @slash_command(
+        name="timezone",
+    )
+    @guild_only()
+    async def timezone(self, interaction: CommandInteraction):
+        pass
+
+    @timezone.sub_command(
+        name="show",
+    )
+    async def show_timezone(self, inter: CommandInteraction) -> None:
+        zone = await self.get_timezone(inter.guild, inter.author.id)
+        now = datetime.datetime.now(tz=zone)
+
+        embed = Embed(
+            title="Timezone",
+            description=f"Your reminders use {md(str(zone)):code}, "
+                        f"it is {md(now.strftime('%H:%M')):bold} there",
+            user=inter.author,
+        ).info
+
+        await inter.send(embed=embed, ephemeral=True)
+
+    @timezone.sub_command(
+        name="set",
+    )
+    async def set_timezone(
+            self,
+            inter: CommandInteraction,
+            name: str = Param(name="name", description="IANA timezone, e.g. Europe/Berlin"),
+    ) -> None:
+        assert name in available_timezones(), f"Unknown timezone {name}"
+
+        await self.set_user_timezone(inter.author.id, name)
+
+        embed = Embed(
+            title="Timezone updated",
+            description=f"Your reminders now use {md(name):code}",
+            user=inter.author,
+        ).success
+
+        await inter.send(embed=embed, ephemeral=True)
+
+    @timezone.sub_command(
+        name="reset",
+    )
+    async def reset_timezone(self, inter: CommandInteraction) -> None:
+        await self.set_user_timezone(inter.author.id, None)
+
+        embed = Embed(
+            title="Timezone reset",
+            description="Your reminders use the server timezone again",
+            user=inter.author,
+        ).success
+
+        await inter.send(embed=embed, ephemeral=True)
+
+    @timezone.sub_command(
+        name="server",
+    )
+    @has_permissions(administrator=True)
+    async def set_server_timezone(
+            self,
+            inter: CommandInteraction,
+            name: str = Param(name="name", description="IANA timezone, e.g. Europe/Berlin"),
+    ) -> None:
+        assert name in available_timezones(), f"Unknown timezone {name}"
+
+        await self.set_guild_timezone(inter.guild, name)
+
+        embed = Embed(
+            title="Server timezone updated",
+            description=f"Members without a timezone of their own now use {md(name):code}",
+            user=inter.author,
+        ).success
+
+        await inter.send(embed=embed)
+
+    @set_timezone.autocomplete("name")
+    @set_server_timezone.autocomplete("name")
+    async def timezone_auto_complete(self, inter: CommandInteraction, name: str) -> list[str]:
+        return search_timezones(name)
+
+    async def cog_slash_command_error(
+            self, inter: ApplicationCommandInteraction, error: Exception
+    ) -> None:
+        if isinstance(error, CommandInvokeError):
+            embed = Embed(
+                title="Error",
+                description=error.args[0],
+                user=inter.author,
+            ).error
+
+            await inter.send(embed=embed, ephemeral=True)
+        elif isinstance(error, disnake.ext.commands.MissingPermissions):
+            embed = Embed(
+                title="Error",
+                description="You don't have permissions to use this command",
+                user=inter.author,
+            ).error
+
+            await inter.send(embed=embed, ephemeral=True)
+        else:
+            raise error
+
+
+def setup(bot: Bot):
+    bot.add_cog(Timezones(bot))
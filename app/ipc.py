@@ -0,0 +1,153 @@
+import asyncio
+import json
+import os
+
+from prisma.models import Reminder
+
+from .bot import Bot, Settings
+from .loggs import logger
+from .services.cache import guild_registry, reminder_cache, reminder_codes
+
+__all__ = ["IPCServer", "IPCClient"]
+
+# reminders_resync follows a reconnect after dropped events, it carries no reminders
+EVENTS = ("reminders_created", "reminders_deleted", "reminders_resync")
+
+# bulk events are split into lines of this many reminders, a line of 100
+# reminders with 2000 character contents stays well below the line limit
+CHUNK_SIZE = 100
+LINE_LIMIT = 1024 * 1024
+
+
+class IPCServer:
+    """
+    Runs in the bot process. Receives the reminder events published by api
+    workers, one JSON object per line and up to ``CHUNK_SIZE`` reminders each,
+    updates the local caches and dispatches the events to the cogs.
+    """
+
+    def __init__(self, bot: Bot, path: str = Settings.IPC_SOCKET):
+        self.bot = bot
+        self.path = path
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=self.path, limit=LINE_LIMIT
+        )
+        logger.info("Listening for api workers on %s", self.path)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # readline drops the oversized line and raises, the stream stays usable
+                    logger.warning("Dropped ipc message longer than %d bytes", LINE_LIMIT, rate=10)
+                    continue
+
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                    event = message["event"]
+                    reminders = [Reminder.parse_obj(data) for data in message["reminders"]]
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Dropped malformed ipc message: %r", line[:200], rate=10)
+                    continue
+
+                if event not in EVENTS:
+                    logger.warning("Dropped unknown ipc event: %s", event, rate=10)
+                    continue
+
+                self._apply(event, reminders)
+                self.bot.dispatch(event, reminders)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _apply(event: str, reminders: list[Reminder]) -> None:
+        if event == "reminders_created":
+            for reminder in reminders:
+                reminder_codes.add(reminder)
+
+                count = guild_registry.reminders_count(reminder.guild_id)
+                if count is not None and count < reminder.reminder_number:
+                    guild_registry.set_reminders_count(reminder.guild_id, reminder.reminder_number)
+
+            reminder_cache.put_many(reminders)
+        elif event == "reminders_resync":
+            reminder_codes.clear()
+            reminder_cache.clear()
+        else:
+            for reminder in reminders:
+                reminder_codes.remove(reminder)
+                reminder_cache.discard(reminder.id)
+
+
+class IPCClient:
+    """
+    Runs in api workers, forwards published events to the bot process.
+
+    The connection is opened lazily and reopened once per event after a
+    failure. Events are dropped with a warning while the bot process is
+    unreachable. The first event sent afterwards is preceded by a
+    ``reminders_resync`` event, the bot then reloads its scheduler window and
+    clears its caches. Reminders dropped that way are due before the resync
+    and the lease sweeper delivers them, at least one lease late.
+    """
+
+    def __init__(self, path: str = Settings.IPC_SOCKET):
+        self.path = path
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        self._dropped = 0
+
+    async def send(self, event: str, reminders: list[Reminder]) -> None:
+        data = [json.loads(reminder.json()) for reminder in reminders]
+        lines = b"".join(
+            json.dumps({"event": event, "reminders": data[start:start + CHUNK_SIZE]}).encode()
+            + b"\n"
+            for start in range(0, len(data), CHUNK_SIZE)
+        )
+
+        async with self._lock:
+            if self._dropped:
+                resync = json.dumps({"event": "reminders_resync", "reminders": []}).encode()
+                lines = resync + b"\n" + lines
+
+            for _ in range(2):
+                try:
+                    if self._writer is None:
+                        _, self._writer = await asyncio.open_unix_connection(self.path)
+
+                    self._writer.write(lines)
+                    await self._writer.drain()
+                    self._dropped = 0
+                    return
+                except OSError:
+                    self._writer = None
+
+            self._dropped += 1
+            logger.warning(
+                "Bot process unreachable on %s, dropped %s of %d reminders",
+                self.path,
+                event,
+                len(reminders),
+            )
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -1,9 +1,21 @@
+import atexit
+import copy
+import datetime
+import json
 import logging
+import os
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 from colorama import Fore, Style, Back
 
-__all__ = ["logger", "prisma_logger", "disnake_logger"]
+__all__ = ["logger", "prisma_logger", "disnake_logger", "log_listener", "LazyLogger"]
+
+# "text" for coloured console output, "json" for one JSON object per line
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
 
 FORMATS = {
     logging.DEBUG: Fore.CYAN,
@@ -68,22 +80,168 @@ class CustomFormatter(logging.Formatter):
     bold_red = "\x1b[31;1m"
     reset = "\x1b[0m"
 
+    def __init__(self):
+        super().__init__()
+        # one formatter per level, built once
+        self._formatters = {level: logging.Formatter(get_format(level)) for level in FORMATS}
+
+    def format(self, record):
+        return self._formatters.get(record.levelno, self._formatters[logging.DEBUG]).format(record)
+
+
+class JSONFormatter(logging.Formatter):
     def format(self, record):
-        log_fmt = get_format(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        created = datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+        entry = {
+            "time": created.isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Hands records to a listener thread of the same process. Only the message is
+    resolved up front, the traceback is formatted by the listener.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _Deferred:
+    __slots__ = ("function",)
+
+    def __init__(self, function):
+        self.function = function
+
+    def __str__(self):
+        return str(self.function())
+
+    def __repr__(self):
+        return repr(self.function())
+
+
+class LazyLogger:
+    """
+    Logger facade that does no work for records below the logger's level.
+
+    Messages use %-style arguments, which are only formatted once the record is
+    emitted. Arguments that are expensive to compute can be wrapped in
+    ``logger.lazy(function)``, the function is only called then as well.
+    High-volume sites can pass ``sample=n`` to emit every n-th record or
+    ``rate=seconds`` to emit at most one record per interval, both counted per
+    message template.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._counts: dict[str, int] = {}
+        self._emitted: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def __getattr__(self, name):
+        return getattr(self.logger, name)
+
+    @staticmethod
+    def lazy(function) -> _Deferred:
+        return _Deferred(function)
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
 
+    def debug(self, msg, *args, **kwargs):
+        self._log(logging.DEBUG, msg, args, **kwargs)
 
-logger = logging.getLogger("discord_bot")
-logger.setLevel(logging.DEBUG)
+    def info(self, msg, *args, **kwargs):
+        self._log(logging.INFO, msg, args, **kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        self._log(logging.WARNING, msg, args, **kwargs)
+
+    warn = warning
+
+    def error(self, msg, *args, **kwargs):
+        self._log(logging.ERROR, msg, args, **kwargs)
+
+    def exception(self, msg, *args, exc_info=True, **kwargs):
+        self._log(logging.ERROR, msg, args, exc_info=exc_info, **kwargs)
+
+    def critical(self, msg, *args, **kwargs):
+        self._log(logging.CRITICAL, msg, args, **kwargs)
+
+    def _log(
+            self, level, msg, args, sample: int | None = None, rate: float | None = None, **kwargs
+    ):
+        if not self.logger.isEnabledFor(level):
+            return
+
+        if sample is not None or rate is not None:
+            suppressed = self._throttle(msg, sample, rate)
+
+            if suppressed is None:
+                return
+
+            if suppressed:
+                msg, args = f"{msg} (%d similar suppressed)", (*args, suppressed)
+
+        self.logger.log(level, msg, *args, stacklevel=3, **kwargs)
+
+    def _throttle(self, key: str, sample: int | None, rate: float | None) -> int | None:
+        """
+        Returns None to drop the record, otherwise how many were dropped since the last one.
+        """
+        if sample is not None:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+
+            if count % sample:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return None
+
+        if rate is not None:
+            now = time.monotonic()
+
+            if now - self._emitted.get(key, -rate) < rate:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return None
+
+            self._emitted[key] = now
+
+        return self._suppressed.pop(key, 0)
+
+
+# Records are put on a queue by the logging call and formatted and written
+# by the listener thread, so the event loop never waits on stdout.
 handler = logging.StreamHandler(stream=sys.stdout)
-handler.setFormatter(CustomFormatter())
-logger.addHandler(handler)
+handler.setFormatter(JSONFormatter() if LOG_FORMAT == "json" else CustomFormatter())
+
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+queue_handler = LocalQueueHandler(log_queue)
+
+logger = LazyLogger(logging.getLogger("discord_bot"))
+logger.setLevel(LOG_LEVEL)
+logger.addHandler(queue_handler)
 
 disnake_logger = logging.getLogger("disnake")
 disnake_logger.setLevel(logging.WARNING)
-disnake_logger.addHandler(handler)
+disnake_logger.addHandler(queue_handler)
 
 prisma_logger = logging.getLogger("prisma")
 prisma_logger.setLevel(logging.WARNING)
-prisma_logger.addHandler(handler)
+prisma_logger.addHandler(queue_handler)
@@ -0,0 +1,6 @@
+from .catchup import CatchUpDelivery  # noqa: F401
+from .dispatch import DispatchQueue, RateLimiter  # noqa: F401
+from .leases import LeaseSweeper  # noqa: F401
+from .loader import ReminderLoader  # noqa: F401
+from .scheduler import ReminderScheduler  # noqa: F401
+from .wheel import TimingWheel  # noqa: F401
@@ -0,0 +1,70 @@
+import asyncio
+import datetime
+
+from .dispatch import DispatchQueue, DispatchStats
+from ..bot import Settings
+from ..loggs import logger
+from ..services.ReminderService import ReminderService
+
+__all__ = ["CatchUpDelivery"]
+
+
+class CatchUpDelivery:
+    """
+    Delivers reminders that expired while the bot was offline.
+
+    Overdue reminders are streamed page by page in ``expires_at`` order and
+    handed to the dispatch queue, which groups them by channel and sends them
+    within the rate limits. The queue is bounded, so paging slows down to the
+    pace of delivery instead of buffering the whole backlog.
+    """
+
+    def __init__(
+            self,
+            service: ReminderService,
+            dispatch: DispatchQueue,
+            page_size: int = Settings.REMINDER_LOAD_PAGE_SIZE,
+            report_every: float = 5,
+    ):
+        self.service = service
+        self.dispatch = dispatch
+        self.page_size = page_size
+        self.report_every = report_every
+
+    async def run(self, until: datetime.datetime) -> DispatchStats:
+        reporter = asyncio.create_task(self._report())
+
+        try:
+            queued = await self._produce(until)
+            await self.dispatch.join()
+        finally:
+            reporter.cancel()
+
+        logger.info("Catch-up of %d overdue reminders finished: %s", queued, self.dispatch.stats)
+        return self.dispatch.stats
+
+    async def _produce(self, until: datetime.datetime) -> int:
+        queued = 0
+        cursor = None
+
+        while True:
+            page = await self.service.get_pending(
+                until, take=self.page_size, cursor=cursor, unclaimed=True
+            )
+
+            claimed = await self.dispatch.claim(
+                [reminder.id for reminder in page if self.service.bot.owns_guild(reminder.guild_id)]
+            )
+
+            await self.dispatch.put_batch(claimed)
+            queued += len(claimed)
+
+            if len(page) < self.page_size:
+                return queued
+
+            cursor = (page[-1].expires_at, page[-1].id)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_every)
+            logger.info("Catch-up in progress: %s", self.dispatch.stats)
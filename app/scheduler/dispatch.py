@@ -0,0 +1,301 @@
+import asyncio
+import datetime
+import itertools
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Iterable
+
+from prisma.models import Reminder
+
+from ..bot import Settings
+from ..loggs import logger
+from ..services.ReminderService import ReminderService
+
+__all__ = ["RateLimiter", "DispatchStats", "DispatchQueue"]
+
+ReminderSender = Callable[[Reminder, Any], Awaitable[None]]
+
+# discord allows 5 messages per 5 seconds in a single channel
+CHANNEL_RATE = 1
+CHANNEL_BURST = 5
+
+
+class RateLimiter:
+    """
+    Token bucket, ``rate`` requests per second with bursts of up to ``burst`` requests.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def idle(self) -> bool:
+        return self._tokens + (time.monotonic() - self._updated) * self.rate >= self.burst
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class DispatchStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.delivered = 0
+        self.failed = 0
+        self.lag = datetime.timedelta()
+
+    @property
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return (self.delivered + self.failed) / elapsed if elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"delivered {self.delivered}, failed {self.failed}, "
+            f"{self.throughput:.1f} reminders/s, lag {self.lag}"
+        )
+
+
+class _Batch:
+    def __init__(self, groups: int):
+        self.pending = groups
+        self.completed: list[Reminder] = []
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class DispatchQueue:
+    """
+    Sits between the scheduler and discord.
+
+    Due reminder ids are collected for a moment and claimed with one query per
+    batch, only the reminders this worker holds a lease on are delivered, so
+    several bot processes can share the table. Leases of claimed reminders are
+    renewed every third of a lease until they are completed, however long they
+    wait behind the rate limits.
+
+    Every batch is split into per-channel groups which are sent by a pool of
+    workers, each channel has its own rate-limit bucket on top of the global
+    one. Once every group of a batch has been sent, the delivered reminders of
+    the batch are completed at once: one-off reminders are removed with a single
+    ``delete_many`` and recurring ones move to their next occurrence. Reminders
+    whose send failed are released for the lease sweeper to retry, after
+    ``attempts`` failures they are completed anyway.
+    """
+
+    def __init__(
+            self,
+            service: ReminderService,
+            send: ReminderSender,
+            workers: int = Settings.DISPATCH_WORKERS,
+            rate: float = Settings.DISPATCH_RATE,
+            batch_size: int = Settings.DISPATCH_BATCH_SIZE,
+            linger: float = 0.05,
+            lease: int = Settings.DELIVERY_LEASE,
+            owner: str | None = None,
+            attempts: int = Settings.DELIVERY_ATTEMPTS,
+    ):
+        self.service = service
+        self.send = send
+        self.workers = workers
+        self.batch_size = batch_size
+        self.linger = linger
+        self.lease = lease
+        self.owner = owner or default_owner()
+        self.attempts = attempts
+        self.stats = DispatchStats()
+
+        self._due: dict[int, Any] = {}
+        # claimed reminders which are queued or being sent
+        self._held: set[int] = set()
+        self._failures: dict[int, int] = {}
+        self._has_due = asyncio.Event()
+        self._groups: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        self._limiter = RateLimiter(rate)
+        self._routes: dict[int, RateLimiter] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, reminder_id: int, interaction: Any = None) -> None:
+        self._due[reminder_id] = interaction
+        self._has_due.set()
+
+    def holds(self, reminder_id: int) -> bool:
+        return reminder_id in self._held
+
+    async def claim(self, reminder_ids: list[int]) -> list[Reminder]:
+        """
+        Claims the reminders among ``reminder_ids`` this worker doesn't hold yet.
+        """
+        claimed = await self.service.claim(
+            [reminder_id for reminder_id in reminder_ids if reminder_id not in self._held],
+            self.owner,
+            self.lease,
+        )
+        self._held.update(reminder.id for reminder in claimed)
+
+        return claimed
+
+    async def put_batch(self, reminders: Iterable[Reminder], interactions: dict | None = None):
+        groups: dict[int, list[Reminder]] = {}
+        for reminder in reminders:
+            groups.setdefault(reminder.channel_id, []).append(reminder)
+
+        batch = _Batch(len(groups))
+
+        for group in groups.values():
+            await self._groups.put((batch, group, interactions or {}))
+
+    async def join(self) -> None:
+        await self._groups.join()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._tasks.append(asyncio.create_task(self._collect()))
+        self._tasks.append(asyncio.create_task(self._renew()))
+        self._tasks.extend(asyncio.create_task(self._work()) for _ in range(self.workers))
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks.clear()
+
+    def _route(self, channel_id: int) -> RateLimiter:
+        bucket = self._routes.get(channel_id)
+
+        if bucket is None:
+            if len(self._routes) > 10_000:
+                self._routes = {key: value for key, value in self._routes.items() if not value.idle}
+
+            bucket = self._routes[channel_id] = RateLimiter(CHANNEL_RATE, CHANNEL_BURST)
+
+        return bucket
+
+    async def _collect(self) -> None:
+        while True:
+            await self._has_due.wait()
+            # let reminders due in the same second pile up into one batch
+            await asyncio.sleep(self.linger)
+
+            ids = list(itertools.islice(self._due, self.batch_size))
+            interactions = {reminder_id: self._due.pop(reminder_id) for reminder_id in ids}
+
+            if not self._due:
+                self._has_due.clear()
+
+            try:
+                reminders = await self.claim(ids)
+            except Exception:  # noqa
+                logger.exception("Failed to claim %d due reminders", len(ids))
+                continue
+
+            if len(reminders) < len(ids):
+                # fires on every tick while several workers compete, at most every 10s
+                logger.debug(
+                    "%d due reminders are held by other workers",
+                    len(ids) - len(reminders),
+                    rate=10,
+                )
+
+            await self.put_batch(reminders, interactions)
+
+    async def _renew(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+
+            if not self._held:
+                continue
+
+            try:
+                await self.service.renew(list(self._held), self.owner, self.lease)
+            except Exception:  # noqa
+                logger.exception("Failed to renew the leases of %d reminders", len(self._held))
+
+    async def _work(self) -> None:
+        while True:
+            batch, group, interactions = await self._groups.get()
+
+            try:
+                await self._send_group(batch, group, interactions)
+            finally:
+                self._groups.task_done()
+
+    async def _send_group(self, batch: _Batch, group: list[Reminder], interactions: dict):
+        bucket = self._route(group[0].channel_id)
+        failed = []
+
+        for reminder in group:
+            await bucket.acquire()
+            await self._limiter.acquire()
+
+            try:
+                await self.send(reminder, interactions.get(reminder.id))
+            except Exception:  # noqa
+                self.stats.failed += 1
+                logger.exception("Failed to deliver reminder %s", reminder.id)
+                failed.append(reminder)
+            else:
+                self.stats.delivered += 1
+                self._failures.pop(reminder.id, None)
+                batch.completed.append(reminder)
+
+            self.stats.lag = self.service.bot.now - reminder.expires_at
+
+        await self._release(batch, failed)
+        batch.pending -= 1
+
+        if batch.pending:
+            return
+
+        try:
+            await self.service.complete(batch.completed)
+        except Exception:  # noqa
+            logger.exception("Failed to complete %d delivered reminders", len(batch.completed))
+        finally:
+            self._held.difference_update(reminder.id for reminder in batch.completed)
+
+    async def _release(self, batch: _Batch, failed: list[Reminder]) -> None:
+        retried = []
+
+        for reminder in failed:
+            self._failures[reminder.id] = self._failures.get(reminder.id, 0) + 1
+
+            if self._failures[reminder.id] < self.attempts:
+                retried.append(reminder.id)
+                continue
+
+            logger.error(
+                "Giving up on reminder %s after %d failed attempts", reminder.id, self.attempts
+            )
+            del self._failures[reminder.id]
+            batch.completed.append(reminder)
+
+        if not retried:
+            return
+
+        try:
+            await self.service.release(retried, self.owner)
+        except Exception:  # noqa
+            # the leases run out on their own, the sweeper retries them after that
+            logger.exception("Failed to release %d undelivered reminders", len(retried))
+        finally:
+            self._held.difference_update(retried)
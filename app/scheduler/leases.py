@@ -0,0 +1,80 @@
+import asyncio
+import datetime
+
+from .dispatch import DispatchQueue
+from ..bot import Settings
+from ..loggs import logger
+from ..services.ReminderService import ReminderService
+
+__all__ = ["LeaseSweeper"]
+
+
+class LeaseSweeper:
+    """
+    Takes over reminders nobody delivered, e.g. because the worker holding
+    their lease crashed or its scheduler never saw them.
+
+    Only reminders overdue by more than one lease are swept, anything newer is
+    still left to the schedulers of the running workers. Reminders this worker
+    already holds are never queued twice, ``DispatchQueue.claim`` skips them.
+    """
+
+    def __init__(
+            self,
+            service: ReminderService,
+            dispatch: DispatchQueue,
+            interval: float | None = None,
+            page_size: int = Settings.REMINDER_LOAD_PAGE_SIZE,
+    ):
+        self.service = service
+        self.dispatch = dispatch
+        self.interval = interval if interval is not None else dispatch.lease / 2
+        self.page_size = page_size
+        self._task: asyncio.Task | None = None
+
+    async def sweep(self) -> int:
+        """
+        Claims and queues every unclaimed overdue reminder, returns how many were queued.
+        """
+        until = self.service.bot.now - datetime.timedelta(seconds=self.dispatch.lease)
+        swept = 0
+        cursor = None
+
+        while True:
+            page = await self.service.get_pending(
+                until, take=self.page_size, cursor=cursor, unclaimed=True
+            )
+
+            claimed = await self.dispatch.claim(
+                [reminder.id for reminder in page if self.service.bot.owns_guild(reminder.guild_id)]
+            )
+
+            await self.dispatch.put_batch(claimed)
+            swept += len(claimed)
+
+            if len(page) < self.page_size:
+                return swept
+
+            cursor = (page[-1].expires_at, page[-1].id)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                swept = await self.sweep()
+            except Exception:  # noqa
+                logger.exception("Failed to sweep expired reminder leases")
+                continue
+
+            if swept:
+                logger.info("Took over %d reminders with expired or missing leases", swept)
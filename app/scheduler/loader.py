@@ -0,0 +1,101 @@
+import asyncio
+import datetime
+
+from .scheduler import ReminderScheduler
+from ..bot import Settings
+from ..loggs import logger
+from ..services.ReminderService import ReminderService
+
+__all__ = ["ReminderLoader"]
+
+
+class ReminderLoader:
+    """
+    Pages reminders into the scheduler one time window at a time.
+
+    Only reminders due before ``loaded_until`` are resident in the scheduler.
+    A background task moves that boundary forward every half horizon, so the
+    next window is already loaded before the current one drains.
+    """
+
+    def __init__(
+            self,
+            service: ReminderService,
+            scheduler: ReminderScheduler,
+            horizon: datetime.timedelta = Settings.REMINDER_LOAD_HORIZON,
+            page_size: int = Settings.REMINDER_LOAD_PAGE_SIZE,
+    ):
+        self.service = service
+        self.scheduler = scheduler
+        self.horizon = horizon
+        self.page_size = page_size
+        self.loaded_until: datetime.datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def covers(self, when: datetime.datetime) -> bool:
+        return self.loaded_until is not None and when <= self.loaded_until
+
+    async def reload(self, after: datetime.datetime | None = None) -> int:
+        self.scheduler.rebuild(())
+        self.loaded_until = after
+
+        return await self.load()
+
+    async def load(self) -> int:
+        """
+        Schedules every reminder due between the previous boundary and
+        ``now + horizon``, returns the number of loaded reminders.
+        """
+        after = self.loaded_until
+        until = self.service.bot.now + self.horizon
+
+        # Move the boundary first so reminders created while we page
+        # are scheduled by the cog instead of being skipped by both sides.
+        self.loaded_until = until
+
+        loaded = 0
+        cursor = None
+
+        while True:
+            try:
+                page = await self.service.get_pending(
+                    until, after=after, take=self.page_size, cursor=cursor
+                )
+            except Exception:
+                self.loaded_until = after
+                raise
+
+            for reminder in page:
+                if self.service.bot.owns_guild(reminder.guild_id):
+                    self.scheduler.schedule(reminder.id, reminder.expires_at)
+
+            loaded += len(page)
+
+            if len(page) < self.page_size:
+                break
+
+            cursor = (page[-1].expires_at, page[-1].id)
+
+        self.scheduler.start()
+        return loaded
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refill())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _refill(self) -> None:
+        while True:
+            await asyncio.sleep(self.horizon.total_seconds() / 2)
+
+            try:
+                loaded = await self.load()
+            except Exception:  # noqa
+                logger.exception("Failed to load the next reminders window")
+                continue
+
+            logger.debug("Loaded %d reminders due before %s", loaded, self.loaded_until)
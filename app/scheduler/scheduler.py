@@ -0,0 +1,88 @@
+import asyncio
+import datetime
+import math
+import time
+from typing import Any, Callable, Iterable
+
+from prisma.models import Reminder
+
+from .wheel import TimingWheel
+
+__all__ = ["ReminderScheduler"]
+
+ReminderCallback = Callable[[int, Any], None]
+
+
+def to_tick(when: datetime.datetime) -> int:
+    return math.ceil(when.timestamp())
+
+
+class ReminderScheduler:
+    """
+    Keeps pending reminders in a hierarchical timing wheel.
+    A single task ticks the wheel once a second and hands every due reminder
+    to ``callback``; while nothing is pending the task sleeps until something
+    gets scheduled.
+    """
+
+    def __init__(self, callback: ReminderCallback):
+        self._callback = callback
+        self._wheel = TimingWheel(int(time.time()))
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    def __contains__(self, reminder_id: int) -> bool:
+        return reminder_id in self._wheel
+
+    def schedule(self, reminder_id: int, when: datetime.datetime, payload: Any = None) -> None:
+        if not self._wheel:
+            self._wheel.advance(int(time.time()))
+
+        self._wheel.insert(reminder_id, to_tick(when), payload)
+        self._changed.set()
+
+    def schedule_many(self, reminders: Iterable[Reminder]) -> None:
+        if not self._wheel:
+            self._wheel.advance(int(time.time()))
+
+        for reminder in reminders:
+            self._wheel.insert(reminder.id, to_tick(reminder.expires_at))
+
+        self._changed.set()
+
+    def cancel(self, reminder_id: int) -> bool:
+        return self._wheel.cancel(reminder_id)
+
+    def rebuild(self, reminders: Iterable[Reminder]) -> None:
+        """
+        Drops the current wheel state and schedules ``reminders`` from scratch.
+        """
+        self._wheel.clear(int(time.time()))
+
+        for reminder in reminders:
+            self._wheel.insert(reminder.id, to_tick(reminder.expires_at))
+
+        self._changed.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            if not self._wheel:
+                self._changed.clear()
+                await self._changed.wait()
+
+            await asyncio.sleep(1 - time.time() % 1)
+
+            for reminder_id, payload in self._wheel.advance(int(time.time())):
+                self._callback(reminder_id, payload)
@@ -0,0 +1,118 @@
+from typing import Any, Hashable, Iterable
+
+__all__ = ["TimingWheel"]
+
+# (granularity in seconds, number of slots) for every level of the wheel.
+LEVELS = (
+    (1, 60),  # seconds
+    (60, 60),  # minutes
+    (60 * 60, 24),  # hours
+    (60 * 60 * 24, 2048),  # days, a bit more than 5 years
+)
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel with one-second resolution.
+
+    Entries close to their deadline live in the fine-grained seconds wheel, far
+    away ones in the coarse minutes/hours/days wheels. When a coarse slot comes
+    up its entries cascade down one or more levels, so every tick only touches
+    the slots that are actually due.
+    """
+
+    def __init__(self, now: int):
+        self._now = now
+        self._wheels: list[list[dict]] = [[{} for _ in range(size)] for _, size in LEVELS]
+        self._due: dict[Hashable, tuple[int, Any]] = {}
+        self._overflow: dict[Hashable, tuple[int, Any]] = {}
+        self._locations: dict[Hashable, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._locations
+
+    @property
+    def now(self) -> int:
+        return self._now
+
+    def insert(self, key: Hashable, deadline: int, payload: Any = None) -> None:
+        self.cancel(key)
+        self._place(key, deadline, payload)
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._locations.pop(key, None)
+
+        if slot is None:
+            return False
+
+        del slot[key]
+        return True
+
+    def advance(self, now: int) -> list[tuple[Hashable, Any]]:
+        """
+        Moves the wheel forward to ``now`` and returns ``(key, payload)`` of
+        every entry whose deadline has been reached.
+        """
+        fired = self._pop(self._due)
+
+        if not self._locations:
+            self._now = max(self._now, now)
+            return fired
+
+        for tick in range(self._now + 1, now + 1):
+            fired.extend(self._tick(tick))
+
+        return fired
+
+    def clear(self, now: int) -> None:
+        self.__init__(now)
+
+    def _tick(self, tick: int) -> Iterable[tuple[Hashable, Any]]:
+        self._now = tick
+
+        if tick % LEVELS[-1][0] == 0 and self._overflow:
+            self._cascade(self._overflow)
+
+        for level in range(len(LEVELS) - 1, 0, -1):
+            granularity, size = LEVELS[level]
+
+            if tick % granularity == 0:
+                self._cascade(self._wheels[level][(tick // granularity) % size])
+
+        return self._pop(self._wheels[0][tick % LEVELS[0][1]]) + self._pop(self._due)
+
+    def _cascade(self, slot: dict) -> None:
+        entries = list(slot.items())
+        slot.clear()
+
+        for key, (deadline, payload) in entries:
+            self._place(key, deadline, payload)
+
+    def _pop(self, slot: dict) -> list[tuple[Hashable, Any]]:
+        fired = []
+
+        for key, (_, payload) in slot.items():
+            del self._locations[key]
+            fired.append((key, payload))
+
+        slot.clear()
+        return fired
+
+    def _place(self, key: Hashable, deadline: int, payload: Any) -> None:
+        delta = deadline - self._now
+
+        if delta <= 0:
+            slot = self._due
+        else:
+            slot = self._overflow
+
+            for (granularity, size), wheel in zip(LEVELS, self._wheels):
+                if delta < granularity * size:
+                    slot = wheel[(deadline // granularity) % size]
+                    break
+
+        slot[key] = (deadline, payload)
+        self._locations[key] = slot
@@ -1,42 +1,133 @@
+from typing import AsyncIterator, Iterable
+
 import disnake
 from prisma import models
 
+from .cache import guild_registry, reminder_cache, reminder_codes
 from .index import CRUDXService
 
 
 class GuildService(CRUDXService):
 
     async def add(self, guild: disnake.Guild) -> models.Guild:
-        self.bot.logger.debug(
-            f"Adding guild: {guild.name} (ID: " f"{guild.id})"
-        )
-        return await self.bot.prisma.guild.create(
+        self.bot.logger.debug("Adding guild: %s (ID: %s)", guild.name, guild.id)
+        created = await self.bot.prisma.guild.create(
             data={"snowflake": guild.snowflake}
         )
 
+        guild_registry.add(created)
+        return created
+
     async def get(self, guild_id: int) -> models.Guild:
-        self.bot.logger.debug(f"Getting guild by id: {guild_id}")
+        self.bot.logger.debug("Getting guild by id: %s", guild_id)
+        snowflake = self.to_safe_snowflake(guild_id)
+
+        if guild_registry.loaded:
+            return guild_registry.get(snowflake)
+
         guild: models.Guild = await self.bot.prisma.guild.find_first(
-            where={"snowflake": self.to_safe_snowflake(guild_id)}
+            where={"snowflake": snowflake}
         )
 
         return guild
 
     async def remove(self, guild: disnake.Guild):
-        self.bot.logger.debug(f"Removing guild: {guild.name} (ID: {guild.id})")
-        return await self.bot.prisma.guild.delete(
+        self.bot.logger.debug("Removing guild: %s (ID: %s)", guild.name, guild.id)
+        removed = await self.bot.prisma.guild.delete(
             where={"snowflake": guild.snowflake}
         )
 
+        guild_registry.remove(guild.snowflake)
+        reminder_cache.drop_guild(guild.snowflake)
+        reminder_codes.drop(guild.snowflake)
+
+        return removed
+
     async def exists(self, guild_id: int) -> bool:
-        self.bot.logger.debug(f"Checking if guild exists: {guild_id}")
+        self.bot.logger.debug("Checking if guild exists: %s", guild_id)
+        snowflake = self.to_safe_snowflake(guild_id)
+
+        if guild_registry.loaded:
+            return snowflake in guild_registry
+
         return (
                 await self.bot.prisma.guild.find_first(
-                    where={"snowflake": self.to_safe_snowflake(guild_id)}
+                    where={"snowflake": snowflake}
                 )
                 is not None
         )
 
+    async def reconcile(
+            self, guilds: Iterable[disnake.Guild], prune: bool = False
+    ) -> tuple[set[str], set[str]]:
+        """
+        Brings the guild table in line with ``guilds`` using one read and one
+        batched write, returns the snowflakes of added and pruned guilds.
+        Guilds the bot has left are only deleted (with their reminders) when ``prune`` is set,
+        and only those owned by the shards of this process.
+        The guild registry is (re)loaded from the result.
+        """
+        known = {guild.snowflake: guild for guild in await self.bot.prisma.guild.find_many()}
+        current = {guild.snowflake for guild in guilds}
+
+        missing = current - known.keys()
+        left = set()
+
+        if prune:
+            left = {
+                snowflake for snowflake in known.keys() - current if self.bot.owns_guild(snowflake)
+            }
+
+        if missing or left:
+            async with self.bot.prisma.batch_() as batcher:
+                for snowflake in missing:
+                    batcher.guild.create(data={"snowflake": snowflake})
+
+                if left:
+                    batcher.reminder.delete_many(where={"guild_id": {"in": list(left)}})
+                    batcher.guild.delete_many(where={"snowflake": {"in": list(left)}})
+
+        for snowflake in left:
+            del known[snowflake]
+            reminder_cache.drop_guild(snowflake)
+            reminder_codes.drop(snowflake)
+
+        added = [models.Guild(snowflake=snowflake, reminders_count=0) for snowflake in missing]
+        guild_registry.load([*known.values(), *added])
+
+        return missing, left
+
+    async def get_page(self, take: int, after: str | None = None) -> list[models.Guild]:
+        """
+        Returns up to ``take`` guilds ordered by snowflake, starting right after ``after``.
+        """
+        return await self.bot.prisma.guild.find_many(
+            where={"snowflake": {"gt": after}} if after is not None else None,
+            order={"snowflake": "asc"},
+            take=take,
+        )
+
+    async def iter_all(self, chunk_size: int = 500) -> AsyncIterator[models.Guild]:
+        """
+        Yields every guild while holding at most ``chunk_size`` rows in memory.
+        """
+        after = None
+
+        while True:
+            guilds = await self.get_page(chunk_size, after=after)
+
+            for guild in guilds:
+                yield guild
+
+            if len(guilds) < chunk_size:
+                return
+
+            after = guilds[-1].snowflake
+
     async def get_all(self) -> list[models.Guild]:
         self.bot.logger.debug("Getting guilds list")
+
+        if guild_registry.loaded:
+            return guild_registry.all()
+
         return await self.bot.prisma.guild.find_many()
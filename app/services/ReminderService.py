@@ -1,15 +1,20 @@
 import datetime
+import time
 from typing import overload
 
 import disnake
 from prisma import models
 from prisma.models import Reminder
 
+from .TimezoneService import TimezoneService
+from .UserService import UserService
+from .cache import guild_registry, reminder_codes, reminder_cache
 from .index import CRUDXService
 from .. import EmbedField
+from ..timeparse import Recurrence
 
 
-class ReminderService(CRUDXService):
+class ReminderService(CRUDXService, UserService, TimezoneService):
     async def add(
             self,
             guild: disnake.Guild,
@@ -17,55 +22,101 @@ class ReminderService(CRUDXService):
             member: disnake.Member,
             expires_at: datetime.datetime,
             content: str,
+            recurrence: Recurrence | None = None,
     ) -> Reminder:
-        current_count = (await self.bot.prisma.guild.find_first(
-            where={
-                "snowflake": guild.snowflake,
-            },
-        )).reminders_count
-
-        # reminder = await self.bot.prisma.reminder.create(
-        #     data={
-        #         "content": content,
-        #         "channel_id": channel.id,
-        #         "author_id": member.id,
-        #         "expires_at": expires_at,
-        #         "reminder_number": current_count + 1,
-        #         "guild": {
-        #             "connect": {
-        #                 "snowflake": guild.snowflake,
-        #             },
-        #         },
-        #     }
-        # )
-
-        upd = await self.bot.prisma.guild.update(
-            where={
-                "snowflake": guild.snowflake,
-            },
+        number = await self._reserve_numbers(guild, 1)
+
+        reminder = await self.bot.prisma.reminder.create(
             data={
-                "reminders_count": current_count + 1,
-                "reminders": {
-                    "create": {
-                        "content": content,
-                        "channel_id": channel.id,
-                        "author_id": member.id,
-                        "expires_at": expires_at,
-                        "reminder_number": current_count + 1,
-                    },
+                "content": content,
+                "channel_id": channel.id,
+                "author_id": member.id,
+                "expires_at": expires_at,
+                "reminder_number": number,
+                "guild_id": guild.snowflake,
+                "recurrence": str(recurrence) if recurrence else None,
+                "starts_at": expires_at if recurrence else None,
+            }
+        )
+
+        reminder_codes.add(reminder)
+        reminder_cache.put(reminder)
+        return reminder
+
+    async def add_many(self, guild: disnake.Guild, reminders: list[dict]) -> list[Reminder]:
+        """
+        Creates ``reminders`` (dicts with content, channel_id, author_id, expires_at
+        and optionally a recurrence rule) in one batch with consecutive codes and
+        publishes a ``reminders_created`` event.
+        """
+        last_number = await self._reserve_numbers(guild, len(reminders))
+        first_number = last_number - len(reminders) + 1
+
+        # a batch runs in one transaction, either every reminder is created or none is
+        async with self.bot.prisma.batch_() as batcher:
+            for number, data in enumerate(reminders, first_number):
+                batcher.reminder.create(
+                    data={
+                        "content": data["content"],
+                        "channel_id": data["channel_id"],
+                        "author_id": data["author_id"],
+                        "expires_at": data["expires_at"],
+                        "recurrence": data.get("recurrence"),
+                        "starts_at": data["expires_at"] if data.get("recurrence") else None,
+                        "reminder_number": number,
+                        "guild_id": guild.snowflake,
+                    }
+                )
+
+        created = await self.bot.prisma.reminder.find_many(
+            where={
+                "guild_id": guild.snowflake,
+                "reminder_number": {
+                    "gte": first_number,
+                    "lte": last_number,
                 },
             },
-            include={
-                "reminders": True,
-            },
+            order={"reminder_number": "asc"},
+        )
+
+        for reminder in created:
+            reminder_codes.add(reminder)
+
+        reminder_cache.put_many(created)
+        await self.bot.publish("reminders_created", created)
+
+        return created
+
+    async def _reserve_numbers(self, guild: disnake.Guild, count: int) -> int:
+        """
+        Bumps the guild's reminder counter by ``count``, returns the last reserved number.
+
+        The UPDATE is atomic, concurrent creates never get the same numbers and the
+        unique key on ``(guild_id, reminder_number)`` rejects anything that slips by.
+        A failed insert leaves a gap in the codes.
+        """
+        rows = await self.bot.prisma.query_raw(
+            'UPDATE "Guild" SET "reminders_count" = "reminders_count" + ? '
+            'WHERE "snowflake" = ? RETURNING "reminders_count"',
+            count,
+            guild.snowflake,
         )
-        # print upd
-        self.bot.logger.debug(str(upd))
 
-        return upd.reminders[-1]
+        if not rows:
+            raise ValueError(f"Guild {guild.snowflake} does not exist")
+
+        number = rows[0]["reminders_count"]
+        guild_registry.set_reminders_count(guild.snowflake, number)
+
+        return number
 
     async def get(self, reminder_id: int, /, include_guild=True) -> Reminder | None:
-        return await self.bot.prisma.reminder.find_unique(
+        reminder = reminder_cache.get(reminder_id)
+
+        if reminder is not None and (not include_guild or reminder.guild is not None):
+            return reminder
+
+        reminder = await self.bot.prisma.reminder.find_unique(
             where={
                 "id": reminder_id,
             },
@@ -74,37 +125,336 @@ class ReminderService(CRUDXService):
             },
         )
 
+        if reminder is not None:
+            reminder_cache.put(reminder)
+
+        return reminder
+
+    async def claim(self, reminder_ids: list[int], owner: str, lease: int) -> list[Reminder]:
+        """
+        Atomically claims the reminders among ``reminder_ids`` that are unclaimed or
+        whose lease ran out, for ``lease`` seconds. Returns the reminders ``owner`` got.
+        """
+        if not reminder_ids:
+            return []
+
+        now = int(time.time())
+        lease_expires_at = now + lease
+
+        # a single UPDATE is atomic in sqlite, prisma's update_many reads the ids first
+        await self.bot.prisma.execute_raw(
+            'UPDATE "Reminder" SET "claimed_by" = ?, "lease_expires_at" = ? '
+            f'WHERE "id" IN ({",".join("?" * len(reminder_ids))}) '
+            'AND ("claimed_by" IS NULL OR "lease_expires_at" < ?)',
+            owner,
+            lease_expires_at,
+            *reminder_ids,
+            now,
+        )
+
+        claimed = await self.bot.prisma.reminder.find_many(
+            where={
+                "id": {
+                    "in": reminder_ids,
+                },
+                "claimed_by": owner,
+                "lease_expires_at": lease_expires_at,
+            }
+        )
+        reminder_cache.put_many(claimed)
+
+        return claimed
+
+    async def renew(self, reminder_ids: list[int], owner: str, lease: int) -> None:
+        """
+        Extends the lease ``owner`` holds on ``reminder_ids`` to ``lease`` seconds from now.
+        """
+        lease_expires_at = int(time.time()) + lease
+
+        # stays well below sqlite's limit of bound parameters
+        for start in range(0, len(reminder_ids), 500):
+            chunk = reminder_ids[start:start + 500]
+
+            await self.bot.prisma.execute_raw(
+                'UPDATE "Reminder" SET "lease_expires_at" = ? '
+                f'WHERE "id" IN ({",".join("?" * len(chunk))}) AND "claimed_by" = ?',
+                lease_expires_at,
+                *chunk,
+                owner,
+            )
+
+    async def release(self, reminder_ids: list[int], owner: str) -> None:
+        """
+        Gives up the lease ``owner`` holds on ``reminder_ids``, so they can be claimed again.
+        """
+        if not reminder_ids:
+            return
+
+        await self.bot.prisma.execute_raw(
+            'UPDATE "Reminder" SET "claimed_by" = NULL, "lease_expires_at" = NULL '
+            f'WHERE "id" IN ({",".join("?" * len(reminder_ids))}) AND "claimed_by" = ?',
+            *reminder_ids,
+            owner,
+        )
+
     async def get_by_code(self, guild: disnake.Guild, code: int) -> Reminder | None:
-        return await self.bot.prisma.reminder.find_first(
+        reminder = reminder_cache.get_by_code(guild.snowflake, int(code))
+
+        if reminder is not None:
+            return reminder
+
+        reminder = await self.bot.prisma.reminder.find_unique(
             where={
-                "reminder_number": int(code),
-                "guild": {
-                    "snowflake": guild.snowflake,
-                }
+                "guild_id_reminder_number": {
+                    "guild_id": guild.snowflake,
+                    "reminder_number": int(code),
+                },
             }
         )
 
+        if reminder is not None:
+            reminder_cache.put(reminder)
+
+        return reminder
+
     async def remove(self, reminder_id: int) -> Reminder | None:
-        return await self.bot.prisma.reminder.delete(
+        reminder = await self.bot.prisma.reminder.delete(
             where={
                 "id": reminder_id,
             }
         )
 
-    async def remove_expired_reminders(self) -> int:
+        if reminder is not None:
+            reminder_codes.remove(reminder)
+
+        reminder_cache.discard(reminder_id)
+        return reminder
+
+    async def remove_many(self, reminders: list[Reminder]) -> int:
+        if not reminders:
+            return 0
+
+        deleted = await self.bot.prisma.reminder.delete_many(
+            where={
+                "id": {
+                    "in": [reminder.id for reminder in reminders],
+                },
+            }
+        )
+
+        for reminder in reminders:
+            reminder_codes.remove(reminder)
+            reminder_cache.discard(reminder.id)
+
+        return deleted
+
+    async def complete(self, reminders: list[Reminder]) -> None:
         """
-        Removes all expired reminders from the database.
-        returns the number of deleted reminders.
+        Finishes delivered reminders. One-off ones are deleted, recurring ones move
+        to their next occurrence and are published as ``reminders_rescheduled``.
         """
+        await self.remove_many([reminder for reminder in reminders if not reminder.recurrence])
 
-        return await self.bot.prisma.reminder.delete_many(
-            where={
-                "expires_at": {
-                    "lte": self.bot.now,
+        recurring = [reminder for reminder in reminders if reminder.recurrence]
+
+        if not recurring:
+            return
+
+        zones = {}
+        for guild_id in {reminder.guild_id for reminder in recurring}:
+            zones[guild_id] = await self.get_timezones(
+                disnake.Object(guild_id),
+                (reminder.author_id for reminder in recurring if reminder.guild_id == guild_id),
+            )
+
+        now = self.bot.now
+        rescheduled = []
+
+        async with self.bot.prisma.batch_() as batcher:
+            for reminder in recurring:
+                changes = {
+                    "expires_at": Recurrence.from_rule(reminder.recurrence).next_after(
+                        reminder.expires_at,
+                        now,
+                        zones[reminder.guild_id][reminder.author_id],
+                        anchor=reminder.starts_at,
+                    ),
+                    "claimed_by": None,
+                    "lease_expires_at": None,
                 }
+
+                # update_many doesn't fail when the reminder was deleted meanwhile
+                batcher.reminder.update_many(where={"id": reminder.id}, data=changes)
+                rescheduled.append(reminder.copy(update=changes))
+
+        reminder_cache.put_many(rescheduled)
+        await self.bot.publish("reminders_rescheduled", rescheduled)
+
+    async def remove_by_codes(self, guild: disnake.Guild, codes: list[int]) -> list[Reminder]:
+        """
+        Deletes the guild's reminders with the given codes and publishes a
+        ``reminders_deleted`` event.
+        """
+        reminders = await self.bot.prisma.reminder.find_many(
+            where={
+                "guild_id": guild.snowflake,
+                "reminder_number": {
+                    "in": codes,
+                },
             }
         )
 
+        if reminders:
+            await self.bot.prisma.reminder.delete_many(
+                where={
+                    "id": {
+                        "in": [reminder.id for reminder in reminders],
+                    },
+                }
+            )
+
+        for reminder in reminders:
+            reminder_codes.remove(reminder)
+            reminder_cache.discard(reminder.id)
+
+        await self.bot.publish("reminders_deleted", reminders)
+
+        return reminders
+
+    async def search_codes(
+            self, guild: disnake.Guild, prefix: str, author_id: int | None = None
+    ) -> list[str]:
+        """
+        Returns up to 25 codes of live reminders starting with ``prefix``,
+        only the guild's first lookup reads the database while the code index is enabled.
+        """
+        codes = reminder_codes.get(guild.snowflake)
+
+        if codes is None:
+            codes = reminder_codes.load(
+                guild.snowflake,
+                await self.bot.prisma.reminder.find_many(
+                    where={
+                        "guild_id": guild.snowflake,
+                    },
+                ),
+            )
+
+        return codes.search(prefix.strip().lstrip("#"), author_id)
+
+    async def get_pending(
+            self,
+            until: datetime.datetime,
+            after: datetime.datetime | None = None,
+            take: int = 500,
+            cursor: tuple[datetime.datetime, int] | None = None,
+            unclaimed: bool = False,
+    ) -> list[Reminder]:
+        """
+        Returns up to ``take`` reminders expiring in ``(after, until]``
+        ordered by ``(expires_at, id)``, starting right after the ``cursor`` key.
+        With ``unclaimed`` reminders leased by a live worker are skipped.
+        """
+        expires_at = {"lte": until}
+
+        if after is not None:
+            expires_at["gt"] = after
+
+        where = {
+            "expires_at": expires_at,
+        }
+
+        if cursor is not None:
+            where["OR"] = self._keyset(cursor, "gt")
+
+        if unclaimed:
+            where["AND"] = [
+                {
+                    "OR": [
+                        {"claimed_by": None},
+                        {"lease_expires_at": {"lt": int(time.time())}},
+                    ],
+                }
+            ]
+
+        return await self.bot.prisma.reminder.find_many(
+            where=where,
+            order=[{"expires_at": "asc"}, {"id": "asc"}],
+            take=take,
+        )
+
+    async def count(
+            self,
+            guild: disnake.Guild = None,
+            member: disnake.Member = None,
+            author_id: int | None = None,
+    ) -> int:
+        return await self.bot.prisma.reminder.count(
+            where=self._filter(guild=guild, member=member, author_id=author_id),
+        )
+
+    async def get_page(
+            self,
+            guild: disnake.Guild = None,
+            member: disnake.Member = None,
+            author_id: int | None = None,
+            take: int = 10,
+            after: tuple[datetime.datetime, int] | None = None,
+            before: tuple[datetime.datetime, int] | None = None,
+            last: bool = False,
+            skip: int = 0,
+    ) -> list[Reminder]:
+        """
+        Returns one page of reminders ordered by ``(expires_at, id)``.
+        The page starts right after the ``after`` key, ends right before
+        the ``before`` key, or is the ``last`` page of the listing.
+        """
+        where = self._filter(guild=guild, member=member, author_id=author_id)
+        descending = before is not None or last
+
+        if after is not None:
+            where["OR"] = self._keyset(after, "gt")
+        elif before is not None:
+            where["OR"] = self._keyset(before, "lt")
+
+        direction = "desc" if descending else "asc"
+
+        reminders = await self.bot.prisma.reminder.find_many(
+            where=where,
+            order=[{"expires_at": direction}, {"id": direction}],
+            take=take,
+            skip=skip,
+        )
+
+        return reminders[::-1] if descending else reminders
+
+    @staticmethod
+    def _filter(
+            guild: disnake.Guild = None,
+            member: disnake.Member = None,
+            author_id: int | None = None,
+    ) -> dict:
+        if member:
+            guild, author_id = member.guild, member.id
+
+        where = {
+            "guild_id": guild.snowflake,
+        }
+
+        if author_id is not None:
+            where["author_id"] = author_id
+
+        return where
+
+    @staticmethod
+    def _keyset(key: tuple[datetime.datetime, int], operator: str) -> list[dict]:
+        expires_at, reminder_id = key
+
+        return [
+            {"expires_at": {operator: expires_at}},
+            {"expires_at": expires_at, "id": {operator: reminder_id}},
+        ]
+
     @overload
     async def get_all(self, guild: disnake.Guild) -> models.Guild:
         ...
@@ -143,19 +493,15 @@ class ReminderService(CRUDXService):
         elif guild and take:
             return await self.bot.prisma.reminder.find_many(
                 where={
-                    "guild": {
-                        "snowflake": guild.snowflake,
-                    }
+                    "guild_id": guild.snowflake,
                 },
                 take=take,
             )
         elif member:
             return await self.bot.prisma.reminder.find_many(
                 where={
+                    "guild_id": member.guild.snowflake,
                     "author_id": member.id,
-                    "guild": {
-                        "snowflake": member.guild.snowflake,
-                    },
                 },
                 take=take,
             )
@@ -165,10 +511,25 @@ class ReminderService(CRUDXService):
                 take=take,
             )
 
-    async def create_field_from_reminder(self, reminder: Reminder) -> EmbedField:
+    async def create_field_from_reminder(
+            self, reminder: Reminder, author_name: str | None = None
+    ) -> EmbedField:
+        if author_name is None:
+            author_name = (await self.get_display_names([reminder.author_id]))[reminder.author_id]
+
+        repeats = f" | every {reminder.recurrence}" if reminder.recurrence else ""
+
         return EmbedField(
             name=f"#{reminder.reminder_number}. "
-                 f"{disnake.utils.format_dt(reminder.expires_at, style='f')} "
-                 f"| {await self.bot.getch_user(reminder.author_id)}",
+                 f"{disnake.utils.format_dt(reminder.expires_at, style='f')}{repeats} "
+                 f"| {author_name}",
             value=f"{reminder.content}",
         )
+
+    async def create_fields_from_reminders(self, reminders: list[Reminder]) -> list[EmbedField]:
+        names = await self.get_display_names(reminder.author_id for reminder in reminders)
+
+        return [
+            await self.create_field_from_reminder(reminder, names[reminder.author_id])
+            for reminder in reminders
+        ]
@@ -0,0 +1,107 @@
+import datetime
+from typing import Iterable
+
+import disnake
+from prisma.models import Reminder
+
+from .cache import guild_registry
+from .index import AppService
+from ..bot import Settings
+from ..cache import LRUCache
+from ..timezones import get_zone
+
+# user id -> IANA name, "" when the user has no timezone of their own
+user_timezones = LRUCache(maxsize=Settings.USER_CACHE_SIZE, ttl=Settings.USER_CACHE_TTL)
+
+
+class TimezoneService(AppService):
+    """
+    Timezones are looked up as user setting, then guild setting, then ``Settings.TIMEZONE``.
+    Names are cached per process and turned into ``tzinfo`` objects by ``get_zone``.
+    """
+
+    async def get_timezone(self, guild: disnake.Guild | None, user_id: int) -> datetime.tzinfo:
+        zones = await self.get_timezones(guild, (user_id,))
+        return zones[user_id]
+
+    async def get_timezones(
+            self, guild: disnake.Guild | None, user_ids: Iterable[int]
+    ) -> dict[int, datetime.tzinfo]:
+        """
+        Resolves the timezone of every user with at most one query for uncached users.
+        """
+        names = {}
+        missing = []
+
+        for user_id in set(user_ids):
+            name = user_timezones.get(user_id)
+
+            if name is None:
+                missing.append(user_id)
+            else:
+                names[user_id] = name
+
+        if missing:
+            users = await self.bot.prisma.user.find_many(
+                where={
+                    "snowflake": {
+                        "in": [str(user_id) for user_id in missing],
+                    },
+                }
+            )
+            found = {int(user.snowflake): user.timezone or "" for user in users}
+
+            for user_id in missing:
+                names[user_id] = found.get(user_id, "")
+                user_timezones.set(user_id, names[user_id])
+
+        fallback = get_zone(await self.get_guild_timezone(guild) if guild is not None else None)
+
+        return {user_id: get_zone(name) if name else fallback for user_id, name in names.items()}
+
+    async def get_guild_timezone(self, guild: disnake.Guild) -> str | None:
+        if guild_registry.loaded:
+            row = guild_registry.get(guild.snowflake)
+        else:
+            row = await self.bot.prisma.guild.find_unique(where={"snowflake": guild.snowflake})
+
+        return row.timezone if row is not None else None
+
+    async def set_user_timezone(self, user_id: int, name: str | None) -> None:
+        await self.bot.prisma.user.upsert(
+            where={
+                "snowflake": str(user_id),
+            },
+            data={
+                "create": {"snowflake": str(user_id), "timezone": name},
+                "update": {"timezone": name},
+            },
+        )
+
+        user_timezones.set(user_id, name or "")
+
+    async def set_guild_timezone(self, guild: disnake.Guild, name: str | None) -> None:
+        updated = await self.bot.prisma.guild.update(
+            where={
+                "snowflake": guild.snowflake,
+            },
+            data={
+                "timezone": name,
+            },
+        )
+
+        if updated is not None and guild_registry.loaded:
+            guild_registry.add(updated)
+
+    async def localize(self, guild: disnake.Guild, reminders: list[Reminder]) -> list[Reminder]:
+        """
+        Returns copies of ``reminders`` with ``expires_at`` in their author's timezone.
+        """
+        zones = await self.get_timezones(guild, (reminder.author_id for reminder in reminders))
+
+        return [
+            reminder.copy(
+                update={"expires_at": reminder.expires_at.astimezone(zones[reminder.author_id])}
+            )
+            for reminder in reminders
+        ]
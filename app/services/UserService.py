@@ -0,0 +1,45 @@
+import asyncio
+from typing import Iterable
+
+import disnake
+
+from .index import AppService
+from ..bot import Settings
+from ..cache import LRUCache
+
+display_names = LRUCache(maxsize=Settings.USER_CACHE_SIZE, ttl=Settings.USER_CACHE_TTL)
+
+
+class UserService(AppService):
+
+    async def get_display_names(self, user_ids: Iterable[int]) -> dict[int, str]:
+        """
+        Resolves display names for ``user_ids``, every id is looked up once and
+        cache misses are fetched concurrently.
+        """
+        names = {}
+        missing = []
+
+        for user_id in set(user_ids):
+            name = display_names.get(user_id)
+
+            if name is None:
+                missing.append(user_id)
+            else:
+                names[user_id] = name
+
+        semaphore = asyncio.Semaphore(Settings.USER_RESOLVE_CONCURRENCY)
+
+        async def resolve(user_id: int) -> None:
+            async with semaphore:
+                try:
+                    name = str(await self.bot.getch_user(user_id))
+                except disnake.NotFound:
+                    name = "Unknown user"
+
+            display_names.set(user_id, name)
+            names[user_id] = name
+
+        await asyncio.gather(*(resolve(user_id) for user_id in missing))
+
+        return names
@@ -0,0 +1,244 @@
+import bisect
+import itertools
+from typing import Iterable
+
+from prisma.models import Guild, Reminder
+
+from ..bot import Settings
+from ..cache import LRUCache
+
+__all__ = [
+    "ReminderCodeIndex",
+    "ReminderCache",
+    "GuildRegistry",
+    "reminder_codes",
+    "reminder_cache",
+    "guild_registry",
+]
+
+
+class _GuildCodes:
+    def __init__(self):
+        self.codes: list[str] = []
+        self.by_author: dict[int, list[str]] = {}
+        self.authors: dict[str, int] = {}
+
+    def add(self, code: str, author_id: int) -> None:
+        if code in self.authors:
+            return
+
+        self.authors[code] = author_id
+        bisect.insort(self.codes, code)
+        bisect.insort(self.by_author.setdefault(author_id, []), code)
+
+    def remove(self, code: str) -> None:
+        author_id = self.authors.pop(code, None)
+
+        if author_id is None:
+            return
+
+        self._discard(self.codes, code)
+        self._discard(self.by_author[author_id], code)
+
+        if not self.by_author[author_id]:
+            del self.by_author[author_id]
+
+    def search(self, prefix: str, author_id: int | None = None, limit: int = 25) -> list[str]:
+        candidates = self.codes if author_id is None else self.by_author.get(author_id, [])
+
+        found = []
+        start = bisect.bisect_left(candidates, prefix)
+
+        for code in itertools.islice(candidates, start, None):
+            if not code.startswith(prefix) or len(found) == limit:
+                break
+
+            found.append(code)
+
+        return found
+
+    @staticmethod
+    def _discard(codes: list[str], code: str) -> None:
+        index = bisect.bisect_left(codes, code)
+
+        if index < len(codes) and codes[index] == code:
+            del codes[index]
+
+
+class ReminderCodeIndex:
+    """
+    In-memory index of live reminder codes per guild and per member,
+    answers prefix queries for autocomplete without touching the database.
+
+    Guilds are loaded on first use and the least recently used ones are
+    dropped once more than ``max_guilds`` are loaded. A ``max_guilds`` of 0
+    keeps nothing, every lookup loads the guild again.
+    """
+
+    def __init__(self, max_guilds: int = Settings.CODE_INDEX_GUILDS):
+        self._guilds = LRUCache(maxsize=max_guilds)
+
+    def get(self, guild_id: str) -> _GuildCodes | None:
+        return self._guilds.get(guild_id)
+
+    def load(self, guild_id: str, reminders: Iterable[Reminder]) -> _GuildCodes:
+        codes = _GuildCodes()
+
+        for reminder in reminders:
+            codes.add(str(reminder.reminder_number), reminder.author_id)
+
+        self._guilds.set(guild_id, codes)
+        return codes
+
+    def add(self, reminder: Reminder) -> None:
+        codes = self._guilds.get(reminder.guild_id)
+
+        if codes is not None:
+            codes.add(str(reminder.reminder_number), reminder.author_id)
+
+    def remove(self, reminder: Reminder) -> None:
+        codes = self._guilds.get(reminder.guild_id)
+
+        if codes is not None:
+            codes.remove(str(reminder.reminder_number))
+
+    def drop(self, guild_id: str) -> None:
+        self._guilds.pop(guild_id)
+
+    def clear(self) -> None:
+        self._guilds.clear()
+
+
+class ReminderCache:
+    """
+    Write-through cache of reminder rows keyed by id and by ``(guild_id, code)``,
+    with a secondary index by guild.
+
+    Memory is bounded by ``maxsize`` rows, the least recently used row is
+    evicted from every index at once. A ``maxsize`` of 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int = Settings.REMINDER_CACHE_SIZE):
+        self._by_id = LRUCache(maxsize=maxsize)
+        self._by_code: dict[tuple[str, int], int] = {}
+        self._by_guild: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def hits(self) -> int:
+        return self._by_id.hits
+
+    @property
+    def misses(self) -> int:
+        return self._by_id.misses
+
+    def get(self, reminder_id: int) -> Reminder | None:
+        return self._by_id.get(reminder_id)
+
+    def get_by_code(self, guild_id: str, code: int) -> Reminder | None:
+        reminder_id = self._by_code.get((guild_id, code))
+
+        if reminder_id is None:
+            self._by_id.misses += 1
+            return None
+
+        return self._by_id.get(reminder_id)
+
+    def by_guild(self, guild_id: str) -> set[int]:
+        return set(self._by_guild.get(guild_id, ()))
+
+    def put(self, reminder: Reminder) -> None:
+        if not self._by_id.maxsize:
+            return
+
+        self.discard(reminder.id)
+
+        for evicted_id, evicted in self._by_id.set(reminder.id, reminder):
+            self._unindex(evicted)
+
+        self._by_code[(reminder.guild_id, reminder.reminder_number)] = reminder.id
+        self._by_guild.setdefault(reminder.guild_id, set()).add(reminder.id)
+
+    def put_many(self, reminders: Iterable[Reminder]) -> None:
+        for reminder in reminders:
+            self.put(reminder)
+
+    def discard(self, reminder_id: int) -> None:
+        reminder = self._by_id.pop(reminder_id)
+
+        if reminder is not None:
+            self._unindex(reminder)
+
+    def drop_guild(self, guild_id: str) -> None:
+        for reminder_id in self.by_guild(guild_id):
+            self.discard(reminder_id)
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_code.clear()
+        self._by_guild.clear()
+
+    def _unindex(self, reminder: Reminder) -> None:
+        self._by_code.pop((reminder.guild_id, reminder.reminder_number), None)
+
+        ids = self._by_guild.get(reminder.guild_id)
+
+        if ids is not None:
+            ids.discard(reminder.id)
+
+            if not ids:
+                del self._by_guild[reminder.guild_id]
+
+
+class GuildRegistry:
+    """
+    Process-local copy of the guild table, loaded once at startup and kept
+    current by ``GuildService``. Until it is loaded every lookup goes to the database.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._guilds: dict[str, Guild] = {}
+
+    def __len__(self) -> int:
+        return len(self._guilds)
+
+    def __contains__(self, snowflake: str) -> bool:
+        return snowflake in self._guilds
+
+    def load(self, guilds: Iterable[Guild]) -> None:
+        self._guilds = {guild.snowflake: guild for guild in guilds}
+        self.loaded = True
+
+    def get(self, snowflake: str) -> Guild | None:
+        return self._guilds.get(snowflake)
+
+    def all(self) -> list[Guild]:
+        return list(self._guilds.values())
+
+    def add(self, guild: Guild) -> None:
+        self._guilds[guild.snowflake] = guild
+
+    def remove(self, snowflake: str) -> None:
+        self._guilds.pop(snowflake, None)
+
+    def set_reminders_count(self, snowflake: str, count: int) -> None:
+        guild = self._guilds.get(snowflake)
+
+        if guild is not None:
+            self._guilds[snowflake] = guild.copy(update={"reminders_count": count})
+
+    def reminders_count(self, snowflake: str) -> int | None:
+        guild = self._guilds.get(snowflake)
+        return guild.reminders_count if guild is not None else None
+
+
+# Api workers and processes sharing delivery don't see the reminders other processes
+# deliver and delete, so they keep neither reminder rows nor codes.
+_cached = Settings.RUN_MODE != "api" and not Settings.SHARED_DELIVERY
+
+reminder_codes = ReminderCodeIndex(Settings.CODE_INDEX_GUILDS if _cached else 0)
+reminder_cache = ReminderCache(Settings.REMINDER_CACHE_SIZE if _cached else 0)
+guild_registry = GuildRegistry()
@@ -0,0 +1,431 @@
+import datetime
+import math
+import re
+
+from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta
+
+from .bot import Settings
+
+__all__ = ["parse_datetime", "parse_recurrence", "Recurrence"]
+
+# the common case, "1d" or "2h30m", skips the tokenizer
+_COMPACT = re.compile(
+    r"(?:(\d+)y)?(?:(\d+)M)?(?:(\d+)w)?(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?"
+)
+
+_COMPACT_UNITS = ("years", "months", "weeks", "days", "hours", "minutes", "seconds")
+_COMPACT_SYMBOLS = dict(zip(_COMPACT_UNITS, "yMwdhms"))
+# recurrences repeat at the same wall-clock time for these units
+_WALL_CLOCK = frozenset(("years", "months", "weeks", "days"))
+
+# Single-letter units are case-sensitive (M is months, m is minutes), words are not.
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<amount>\d+)\s*(?P<unit>
+            (?i:years?|yrs?|months?|weeks?|wks?|days?|hours?|hrs?|minutes?|mins?|seconds?|secs?)
+            |[yMwdhms]
+        )(?![A-Za-z])
+      | (?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>(?i:am|pm))(?![A-Za-z])
+      | (?P<clock_hour>\d{1,2}):(?P<clock_minute>\d{2})(?!\d)
+      | (?P<word>(?i:[a-z]+))
+    )\s*
+    """,
+    re.VERBOSE,
+)
+
+_UNITS = {
+    "y": "years",
+    "M": "months",
+    "w": "weeks",
+    "d": "days",
+    "h": "hours",
+    "m": "minutes",
+    "s": "seconds",
+    "yr": "years",
+    "mo": "months",
+    "wk": "weeks",
+    "hr": "hours",
+    "mi": "minutes",
+    "se": "seconds",
+}
+
+_WEEKDAYS = {
+    name: index
+    for index, names in enumerate(
+        (
+            ("monday", "mon"),
+            ("tuesday", "tue", "tues"),
+            ("wednesday", "wed"),
+            ("thursday", "thu", "thur", "thurs"),
+            ("friday", "fri"),
+            ("saturday", "sat"),
+            ("sunday", "sun"),
+        )
+    )
+    for name in names
+}
+
+_EVERY = re.compile(r"(?i:every)\s+")
+# "every day 9am" repeats daily, the rest of the phrase picks the first occurrence
+_PERIODS = {
+    "year": "years",
+    "month": "months",
+    "week": "weeks",
+    "day": "days",
+    "hour": "hours",
+    "minute": "minutes",
+}
+
+_DAYS = {"today": 0, "tomorrow": 1}
+_TIMES = {"noon": (12, 0), "midnight": (0, 0)}
+_FILLERS = frozenset(("in", "at", "on", "and"))
+
+
+def _elapsed(moment: datetime.datetime, delta: datetime.timedelta) -> datetime.datetime:
+    """
+    Adds ``delta`` as elapsed time, aware arithmetic in a zone with DST is wall-clock.
+    """
+    return (moment.astimezone(datetime.timezone.utc) + delta).astimezone(moment.tzinfo)
+
+
+def _unit(unit: str) -> str:
+    if len(unit) == 1:
+        return _UNITS[unit]
+
+    unit = unit.lower()
+    return _UNITS.get(unit[:2], unit.rstrip("s") + "s")
+
+
+def _parse_durations(text: str) -> dict[str, int] | None:
+    """
+    Parses text made only of durations ("1d", "2 hours 30 minutes") into unit amounts.
+    """
+    compact = _COMPACT.fullmatch(text)
+
+    if compact is not None:
+        if compact.lastindex is None:
+            return None
+
+        return {
+            unit: int(group)
+            for unit, group in zip(_COMPACT_UNITS, compact.groups())
+            if group
+        }
+
+    amounts = {}
+    position = 0
+
+    while position < len(text):
+        token = _TOKEN.match(text, position)
+
+        if token is None:
+            return None
+
+        position = token.end()
+
+        if token.lastgroup == "unit":
+            unit = _unit(token["unit"])
+            amounts[unit] = amounts.get(unit, 0) + int(token["amount"])
+        elif token.lastgroup != "word" or token["word"].lower() not in _FILLERS:
+            return None
+
+    return amounts or None
+
+
+class Recurrence:
+    """
+    Fixed interval between occurrences of a reminder, stored as its compact
+    duration ("1d", "1w", "2h30m", "1M"). Days, weeks, months and years keep
+    the wall-clock time in the author's timezone, hours, minutes and seconds
+    are elapsed time, so "every 2h" stays two hours apart across DST changes.
+    """
+
+    MIN_INTERVAL = datetime.timedelta(minutes=1)
+
+    def __init__(self, **amounts: int):
+        self.amounts = {unit: amounts[unit] for unit in _COMPACT_UNITS if amounts.get(unit)}
+        self._elapsed = datetime.timedelta(
+            **{unit: amount for unit, amount in self.amounts.items() if unit not in _WALL_CLOCK}
+        )
+        self._calendar = relativedelta(
+            **{unit: amount for unit, amount in self.amounts.items() if unit in _WALL_CLOCK}
+        )
+
+    @classmethod
+    def from_rule(cls, rule: str) -> "Recurrence":
+        amounts = _parse_durations(rule)
+
+        if amounts is None:
+            raise ValueError(f"Invalid recurrence rule {rule!r}")
+
+        return cls(**amounts)
+
+    def __str__(self):
+        return "".join(f"{amount}{_COMPACT_SYMBOLS[unit]}" for unit, amount in self.amounts.items())
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self)!r})"
+
+    @property
+    def interval(self) -> datetime.timedelta:
+        """
+        Shortest possible interval, months count as 28 days and years as 365.
+        """
+        return self._elapsed + datetime.timedelta(
+            weeks=self.amounts.get("weeks", 0),
+            days=self.amounts.get("days", 0)
+            + self.amounts.get("months", 0) * 28
+            + self.amounts.get("years", 0) * 365,
+        )
+
+    @property
+    def _longest(self) -> datetime.timedelta:
+        # months count as 31 days, years as 366 and every wall-clock step may gain a DST hour
+        return self._elapsed + datetime.timedelta(
+            weeks=self.amounts.get("weeks", 0),
+            days=self.amounts.get("days", 0)
+            + self.amounts.get("months", 0) * 31
+            + self.amounts.get("years", 0) * 366,
+            hours=1 if self._calendar else 0,
+        )
+
+    def _nth(self, start: datetime.datetime, steps: int) -> datetime.datetime:
+        # wall-clock arithmetic drops the fold of times in the repeated DST hour
+        if self._calendar:
+            start += self._calendar * steps
+
+        return _elapsed(start, self._elapsed * steps)
+
+    def next_after(
+            self,
+            previous: datetime.datetime,
+            now: datetime.datetime,
+            tz: datetime.tzinfo,
+            anchor: datetime.datetime | None = None,
+    ) -> datetime.datetime:
+        """
+        First occurrence after ``now``, occurrences missed since ``previous`` are skipped.
+
+        Monthly and yearly occurrences are counted from ``anchor``, the first
+        occurrence, so "every 1M" from Jan 31 goes to Feb 28 and back to Mar 31.
+        Without it they are counted from ``previous`` and stay on a clamped day.
+        """
+        if anchor is None or not (self.amounts.keys() & {"years", "months"}):
+            anchor = previous
+
+        start = anchor.astimezone(tz)
+        # never overshoots, the few steps left are walked one by one
+        steps = max(1, math.floor((now - start) / self._longest))
+        target = self._nth(start, steps)
+
+        while target <= now or target <= previous:
+            steps += 1
+            target = self._nth(start, steps)
+
+        return target
+
+
+def parse_recurrence(input_string: str) -> Recurrence | None:
+    """
+    Returns the recurrence of "every ..." input ("every 1d", "every day 9am",
+    "every monday"), None for one-off input. Raises ``ValueError`` for
+    unparsable or too frequent rules.
+    """
+    text = input_string.strip()
+    every = _EVERY.match(text)
+
+    if every is None:
+        return None
+
+    rest = text[every.end():]
+    word = rest.split(maxsplit=1)[0].lower() if rest else ""
+
+    if word in _PERIODS:
+        recurrence = Recurrence(**{_PERIODS[word]: 1})
+    elif word in _WEEKDAYS:
+        recurrence = Recurrence(weeks=1)
+    else:
+        amounts = _parse_durations(rest)
+
+        if amounts is None:
+            raise ValueError(f"Invalid recurrence {input_string!r}")
+
+        recurrence = Recurrence(**amounts)
+
+    if recurrence.interval < Recurrence.MIN_INTERVAL:
+        raise ValueError(f"Reminders can't repeat more often than every {Recurrence.MIN_INTERVAL}")
+
+    return recurrence
+
+
+def _parse_natural(text: str, now: datetime.datetime) -> datetime.datetime | None:
+    """
+    Parses durations ("2h30m", "in 3 days") and day/time phrases
+    ("tomorrow 9am", "next friday 18:30"), returns None for anything else.
+    """
+    amounts = dict.fromkeys(("years", "months", "weeks", "days", "hours", "minutes", "seconds"), 0)
+    days_ahead = None
+    # a bare weekday may be today, it moves a week ahead once that moment has passed
+    weekday_rolls = False
+    time_of_day = None
+    after_next = False
+    position = 0
+
+    while position < len(text):
+        token = _TOKEN.match(text, position)
+
+        if token is None or token.end() == position:
+            return None
+
+        position = token.end()
+        kind = token.lastgroup
+
+        if kind == "unit":
+            amounts[_unit(token["unit"])] += int(token["amount"])
+
+        elif kind == "meridiem":
+            hour, minute = int(token["hour"]), int(token["minute"] or 0)
+
+            if not 1 <= hour <= 12 or minute > 59:
+                return None
+
+            time_of_day = (hour % 12 + (12 if token["meridiem"].lower() == "pm" else 0), minute)
+
+        elif kind == "clock_minute":
+            hour, minute = int(token["clock_hour"]), int(token["clock_minute"])
+
+            if hour > 23 or minute > 59:
+                return None
+
+            time_of_day = (hour, minute)
+
+        else:
+            word = token["word"].lower()
+
+            if after_next and word == "week":
+                amounts["weeks"] += 1
+            elif word in _WEEKDAYS:
+                days_ahead = (_WEEKDAYS[word] - now.weekday()) % 7
+                weekday_rolls = not after_next
+
+                if after_next and not days_ahead:
+                    days_ahead = 7
+            elif word in _DAYS and not after_next:
+                days_ahead = _DAYS[word]
+            elif word in _TIMES and not after_next:
+                time_of_day = _TIMES[word]
+            elif word not in _FILLERS and word != "next":
+                return None
+
+            after_next = word == "next"
+            continue
+
+        if after_next:
+            return None
+
+    if after_next or (days_ahead is None and time_of_day is None and not any(amounts.values())):
+        return None
+
+    # day phrases and calendar units move the wall clock, durations are elapsed time
+    target = now
+
+    if days_ahead:
+        target += datetime.timedelta(days=days_ahead)
+
+    target = _elapsed(
+        target,
+        datetime.timedelta(
+            weeks=amounts["weeks"],
+            days=amounts["days"],
+            hours=amounts["hours"],
+            minutes=amounts["minutes"],
+            seconds=amounts["seconds"],
+        ),
+    )
+
+    if amounts["years"] or amounts["months"]:
+        target += relativedelta(years=amounts["years"], months=amounts["months"])
+
+    if time_of_day is not None:
+        target = target.replace(hour=time_of_day[0], minute=time_of_day[1], second=0, microsecond=0)
+
+        # a bare time of day means its next occurrence
+        if target <= now and days_ahead is None:
+            target += datetime.timedelta(days=1)
+
+    if weekday_rolls and target <= now:
+        target += datetime.timedelta(weeks=1)
+
+    return target
+
+
+def parse_datetime(
+        input_string: str,
+        tz: datetime.tzinfo | None = None,
+        now: datetime.datetime | None = None,
+) -> datetime.datetime:
+    """
+    Turns user input into an aware datetime in ``tz``, ``Settings.TIMEZONE`` by default.
+
+    Understands durations ("1d", "2h30m", "in 3 days"), "tomorrow", "next week",
+    weekdays and times of day ("tomorrow 9am", "next friday 18:30"), anything
+    else goes to ``dateutil``. Raises ``ValueError`` for unparsable input.
+    """
+    if tz is None:
+        tz = Settings.TIMEZONE
+
+    if now is None:
+        now = datetime.datetime.now(tz=tz)
+
+    text = input_string.strip()
+    every = _EVERY.match(text)
+
+    if every is not None:
+        return _first_occurrence(text, every.end(), tz, now)
+
+    compact = _COMPACT.fullmatch(text)
+
+    if compact is not None and compact.lastindex is not None:
+        years, months, weeks, days, hours, minutes, seconds = (
+            int(group) if group else 0 for group in compact.groups()
+        )
+        target = _elapsed(
+            now,
+            datetime.timedelta(
+                weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds
+            ),
+        )
+
+        if years or months:
+            target += relativedelta(years=years, months=months)
+
+        return target
+
+    target = _parse_natural(text, now)
+
+    if target is None:
+        target = parse(text)
+
+        if target.tzinfo is None:
+            target = target.replace(tzinfo=tz)
+
+    return target
+
+
+def _first_occurrence(
+        text: str, start: int, tz: datetime.tzinfo, now: datetime.datetime
+) -> datetime.datetime:
+    recurrence = parse_recurrence(text)
+    rest = text[start:]
+    period, _, phrase = rest.partition(" ")
+
+    if period.lower() in _PERIODS:
+        rest = phrase.strip()
+
+    # "every 2h" and "every day" start one interval from now, "every day 9am" at the next 9am
+    if not rest or _parse_durations(rest) is not None:
+        return recurrence.next_after(now, now, tz)
+
+    return parse_datetime(rest, tz, now)
@@ -0,0 +1,29 @@
+import datetime
+import functools
+import zoneinfo
+
+from .bot import Settings
+
+__all__ = ["get_zone", "available_timezones", "search_timezones"]
+
+
+@functools.lru_cache(maxsize=None)
+def get_zone(name: str | None) -> datetime.tzinfo:
+    """
+    Resolves an IANA timezone name once per process, None is ``Settings.TIMEZONE``.
+    Raises ``zoneinfo.ZoneInfoNotFoundError`` for unknown names.
+    """
+    if name is None:
+        return Settings.TIMEZONE
+
+    return zoneinfo.ZoneInfo(name)
+
+
+@functools.lru_cache(maxsize=1)
+def available_timezones() -> tuple[str, ...]:
+    return tuple(sorted(zoneinfo.available_timezones()))
+
+
+def search_timezones(query: str, limit: int = 25) -> list[str]:
+    query = query.lower()
+    return [name for name in available_timezones() if query in name.lower()][:limit]
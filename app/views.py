@@ -3,6 +3,7 @@ from disnake import MessageInteraction
 from disnake.ui import View, Item
 
 from app import Bot, Embed
+from app.cache import LRUCache
 from app.types import DiscordUtilizer
 
 
@@ -61,42 +62,89 @@ class BaseView(View):
             raise error
 
 
+class PageProvider:
+    """
+    Supplies pages to ``PaginationView`` only when they are shown.
+    """
+
+    async def count(self) -> int:
+        raise NotImplementedError
+
+    async def get_page(self, index: int) -> disnake.Embed:
+        raise NotImplementedError
+
+
+class StaticPageProvider(PageProvider):
+
+    def __init__(self, pages: list[disnake.Embed]):
+        self.pages = pages
+
+    async def count(self) -> int:
+        return len(self.pages)
+
+    async def get_page(self, index: int) -> disnake.Embed:
+        return self.pages[index]
+
+
 class PaginationView(BaseView):
 
     def __init__(
             self,
             bot: Bot,
             user: DiscordUtilizer,
-            pages: list[Embed],
+            pages: list[disnake.Embed] | PageProvider,
+            page_count: int | None = None,
+            cache_size: int = 5,
             **kwargs,
     ):
         super().__init__(bot, user, **kwargs)
-        self.pages = pages
+
+        if isinstance(pages, PageProvider):
+            assert page_count is not None, "page_count is required with a page provider"
+            self.provider = pages
+            self.page_count = page_count
+        else:
+            self.provider = StaticPageProvider(pages)
+            self.page_count = len(pages)
+
+        self.rendered = LRUCache(maxsize=cache_size)
         self.current_page = 0
 
         self._update_state()
 
+    async def get_page(self, index: int) -> disnake.Embed:
+        page = self.rendered.get(index)
+
+        if page is None:
+            page = await self.provider.get_page(index)
+            self.rendered.set(index, page)
+
+        return page
+
     def _update_state(self) -> None:
-        if len(self.pages) == 1:
+        if self.page_count == 1:
             self.clear_items()
             self.stop()
 
         self.first_page.disabled = self.prev_page.disabled = self.current_page == 0
-        self.last_page.disabled = self.next_page.disabled = self.current_page == len(self.pages) - 1
+        self.last_page.disabled = self.next_page.disabled = (
+                self.current_page == self.page_count - 1
+        )
+
+    async def _show_current_page(self, inter: disnake.MessageInteraction) -> None:
+        self._update_state()
+
+        await inter.response.edit_message(embed=await self.get_page(self.current_page), view=self)
 
     @disnake.ui.button(emoji="⏪", style=disnake.ButtonStyle.blurple)
     async def first_page(self, _button: disnake.ui.Button, inter: disnake.MessageInteraction):
         self.current_page = 0
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.pages[self.current_page], view=self)
+        await self._show_current_page(inter)
 
     @disnake.ui.button(emoji="◀", style=disnake.ButtonStyle.secondary)
     async def prev_page(self, _button: disnake.ui.Button, inter: disnake.MessageInteraction):
         self.current_page -= 1
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.pages[self.current_page], view=self)
+        await self._show_current_page(inter)
 
     @disnake.ui.button(emoji="🗑️", style=disnake.ButtonStyle.red, custom_id="delete")
     async def remove(self, _button: disnake.ui.Button, inter: disnake.MessageInteraction):
@@ -105,13 +153,9 @@ class PaginationView(BaseView):
     @disnake.ui.button(emoji="▶", style=disnake.ButtonStyle.secondary)
     async def next_page(self, _button: disnake.ui.Button, inter: disnake.MessageInteraction):
         self.current_page += 1
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.pages[self.current_page], view=self)
+        await self._show_current_page(inter)
 
     @disnake.ui.button(emoji="⏩", style=disnake.ButtonStyle.blurple)
     async def last_page(self, _button: disnake.ui.Button, inter: disnake.MessageInteraction):
-        self.current_page = len(self.pages) - 1
-        self._update_state()
-
-        await inter.response.edit_message(embed=self.pages[self.current_page], view=self)
+        self.current_page = self.page_count - 1
+        await self._show_current_page(inter)
@@ -8,6 +8,7 @@ from fastapi.middleware.gzip import GZipMiddleware
 from app import Bot
 from app.apis import apis
 from app.db import prisma
+from app.ipc import IPCClient, IPCServer
 
 app = FastAPI()
 app.add_middleware(GZipMiddleware, minimum_size=1000)
@@ -32,17 +33,24 @@ def load_env():
 async def load_cogs():
     cogs_folder = bot.BASE_DIR / "app" / "cogs"
     for cog in cogs_folder.glob("*.py"):
-        bot.logger.debug("Found cog: {}".format(cog.stem))
+        bot.logger.debug("Found cog: %s", cog.stem)
         if cog.name.startswith("_"):
-            bot.logger.debug("Skipping cog: {}".format(cog.stem))
+            bot.logger.debug("Skipping cog: %s", cog.stem)
             continue
         bot.load_extension(f"app.cogs.{cog.stem}")
-        bot.logger.info("Loaded cog: {}".format(cog.stem))
+        bot.logger.info("Loaded cog: %s", cog.stem)
 
 
 @app.on_event("startup")
 async def startup():
     load_env()
+
+    if bot.APP_SETTINGS.RUN_MODE == "api":
+        await prisma.connect()
+        bot.ipc = IPCClient()
+        bot.logger.info("Started api worker %d.", os.getpid())
+        return
+
     await load_cogs()
 
     try:
@@ -51,9 +59,7 @@ async def startup():
 
         # Print message with each logger level
 
-        bot.logger.info(
-            f"Starting bot in {os.getenv('STATE_NAME').title()} mode."
-        )
+        bot.logger.info("Starting bot in %s mode.", os.getenv("STATE_NAME").title())
 
         if isinstance(discord_token, str) and len(discord_token) > 5:
             asyncio.create_task(bot.start(discord_token))
@@ -66,4 +72,29 @@ async def startup():
 
 @app.on_event("shutdown")
 async def shutdown():
+    if bot.ipc is not None:
+        await bot.ipc.close()
+
     await prisma.disconnect()
+
+
+async def run_bot():
+    """
+    Runs only the gateway bot and the scheduler, api workers reach it through ``IPCServer``.
+    """
+    load_env()
+    await load_cogs()
+    await prisma.connect()
+
+    server = IPCServer(bot)
+    await server.start()
+
+    try:
+        await bot.start(os.getenv("DISCORD_TOKEN"))
+    finally:
+        await server.stop()
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_bot())
@@ -0,0 +1,89 @@
+"""
+Measures ReminderService.add latency for a guild that already has
+0, 1 000, 10 000 ... reminders. The latency should stay flat.
+
+    python -m scripts.bench_reminder_create --sizes 0 1000 10000 --runs 200
+
+Runs against the configured database in a throwaway guild with a negative
+id, which no real guild can have, and removes it afterwards.
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import statistics
+import time
+
+import disnake
+
+from app import Bot, prisma
+
+
+
+async def fill(guild: disnake.Object, until: int, expires_at: datetime.datetime) -> None:
+    current = (await prisma.guild.find_unique(where={"snowflake": guild.snowflake})).reminders_count
+
+    async with prisma.batch_() as batcher:
+        for number in range(current + 1, until + 1):
+            batcher.reminder.create(
+                data={
+                    "content": "bench",
+                    "channel_id": 1,
+                    "author_id": 1,
+                    "expires_at": expires_at,
+                    "reminder_number": number,
+                    "guild_id": guild.snowflake,
+                }
+            )
+
+        batcher.guild.update(
+            where={"snowflake": guild.snowflake},
+            data={"reminders_count": max(current, until)},
+        )
+
+
+async def main(sizes: list[int], runs: int) -> None:
+    from app.services.ReminderService import ReminderService
+
+    bot = Bot()
+    service = ReminderService()
+    service.bot = bot
+
+    # discord snowflakes are positive, a negative id never belongs to a real guild
+    guild = disnake.Object(-random.randint(1, 2**31))
+    author = disnake.Object(1)
+    expires_at = bot.now + datetime.timedelta(days=365)
+
+    await prisma.connect()
+    await prisma.guild.create(data={"snowflake": guild.snowflake})
+
+    try:
+        print(f"{'reminders':>10} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+
+        for size in sorted(sizes):
+            await fill(guild, size, expires_at)
+
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                await service.add(guild, author, author, expires_at, "bench")
+                timings.append((time.perf_counter() - started) * 1000)
+
+            timings.sort()
+            print(
+                f"{size:>10} {statistics.mean(timings):>10.2f} "
+                f"{timings[len(timings) // 2]:>10.2f} {timings[int(len(timings) * 0.95)]:>10.2f}"
+            )
+    finally:
+        await prisma.reminder.delete_many(where={"guild_id": guild.snowflake})
+        await prisma.guild.delete(where={"snowflake": guild.snowflake})
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1_000, 10_000, 50_000])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.runs))
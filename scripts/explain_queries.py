@@ -0,0 +1,155 @@
+"""
+Runs EXPLAIN QUERY PLAN for every query ReminderService emits and fails
+if any of them scans a whole table.
+
+    python -m scripts.explain_queries [path/to/dev.db]
+
+The statements mirror the SQL prisma generates for each service method,
+the database has to be migrated to the current schema.
+"""
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+DEFAULT_DATABASE = Path(__file__).resolve().parent.parent / "prisma" / "dev.db"
+
+REMINDER = '"main"."Reminder"'
+GUILD = '"main"."Guild"'
+USER = '"main"."User"'
+
+# method -> list of (sql, parameters)
+QUERIES: dict[str, list[tuple[str, tuple]]] = {
+    "ReminderService.add": [
+        ('UPDATE "Guild" SET "reminders_count" = "reminders_count" + ? '
+         'WHERE "snowflake" = ? RETURNING "reminders_count"', (1, "1")),
+        (f'SELECT * FROM {REMINDER} WHERE {REMINDER}."id" = ? LIMIT ?', (1, 1)),
+    ],
+    "ReminderService.add_many": [
+        ('UPDATE "Guild" SET "reminders_count" = "reminders_count" + ? '
+         'WHERE "snowflake" = ? RETURNING "reminders_count"', (3, "1")),
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND {REMINDER}."reminder_number" >= ? AND {REMINDER}."reminder_number" <= ?) '
+         f'ORDER BY {REMINDER}."reminder_number" ASC', ("1", 1, 3)),
+    ],
+    "ReminderService.get_by_code": [
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND {REMINDER}."reminder_number" = ?) LIMIT ?', ("1", 1, 1)),
+    ],
+    "ReminderService.remove": [
+        (f'DELETE FROM {REMINDER} WHERE {REMINDER}."id" = ?', (1,)),
+    ],
+    "ReminderService.remove_many": [
+        (f'DELETE FROM {REMINDER} WHERE {REMINDER}."id" IN (?,?,?)', (1, 2, 3)),
+    ],
+    "ReminderService.remove_by_codes": [
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND {REMINDER}."reminder_number" IN (?,?,?))', ("1", 1, 2, 3)),
+        (f'DELETE FROM {REMINDER} WHERE {REMINDER}."id" IN (?,?,?)', (1, 2, 3)),
+    ],
+    "ReminderService.search_codes": [
+        (f'SELECT * FROM {REMINDER} WHERE {REMINDER}."guild_id" = ?', ("1",)),
+    ],
+    "ReminderService.complete": [
+        (f'DELETE FROM {REMINDER} WHERE {REMINDER}."id" IN (?,?,?)', (1, 2, 3)),
+        # update_many reads the matching ids before updating them
+        (f'SELECT {REMINDER}."id" FROM {REMINDER} WHERE {REMINDER}."id" = ?', (1,)),
+        (f'UPDATE {REMINDER} SET "expires_at" = ?, "claimed_by" = ?, "lease_expires_at" = ? '
+         f'WHERE {REMINDER}."id" IN (?)', (0, None, None, 1)),
+        (f'SELECT * FROM {USER} WHERE {USER}."snowflake" IN (?,?)', ("1", "2")),
+    ],
+    "ReminderService.get_pending": [
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."expires_at" <= ? '
+         f'AND {REMINDER}."expires_at" > ?) '
+         f'ORDER BY {REMINDER}."expires_at" ASC, {REMINDER}."id" ASC LIMIT ?', (0, 0, 500)),
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."expires_at" <= ? '
+         f'AND ({REMINDER}."expires_at" > ? OR ({REMINDER}."expires_at" = ? '
+         f'AND {REMINDER}."id" > ?))) '
+         f'ORDER BY {REMINDER}."expires_at" ASC, {REMINDER}."id" ASC LIMIT ?', (0, 0, 0, 1, 500)),
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."expires_at" <= ? '
+         f'AND ({REMINDER}."claimed_by" IS NULL OR {REMINDER}."lease_expires_at" < ?)) '
+         f'ORDER BY {REMINDER}."expires_at" ASC, {REMINDER}."id" ASC LIMIT ?', (0, 0, 500)),
+    ],
+    "ReminderService.get_all(guild)": [
+        (f'SELECT * FROM {GUILD} WHERE {GUILD}."snowflake" = ? LIMIT ?', ("1", 1)),
+        (f'SELECT * FROM {REMINDER} WHERE {REMINDER}."guild_id" IN (?)', ("1",)),
+    ],
+    "ReminderService.get_all(guild, take)": [
+        (f'SELECT * FROM {REMINDER} WHERE {REMINDER}."guild_id" = ? LIMIT ?', ("1", 24)),
+    ],
+    "ReminderService.get_all(member)": [
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND {REMINDER}."author_id" = ?) LIMIT ?', ("1", 1, 24)),
+    ],
+    "ReminderService.count": [
+        (f'SELECT COUNT(*) FROM {REMINDER} WHERE {REMINDER}."guild_id" = ?', ("1",)),
+        (f'SELECT COUNT(*) FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND {REMINDER}."author_id" = ?)', ("1", 1)),
+    ],
+    "ReminderService.get_page": [
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND ({REMINDER}."expires_at" > ? OR ({REMINDER}."expires_at" = ? '
+         f'AND {REMINDER}."id" > ?))) '
+         f'ORDER BY {REMINDER}."expires_at" ASC, {REMINDER}."id" ASC LIMIT ?', ("1", 0, 0, 1, 10)),
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."guild_id" = ? '
+         f'AND {REMINDER}."author_id" = ? '
+         f'AND ({REMINDER}."expires_at" < ? OR ({REMINDER}."expires_at" = ? '
+         f'AND {REMINDER}."id" < ?))) '
+         f'ORDER BY {REMINDER}."expires_at" DESC, {REMINDER}."id" DESC LIMIT ?',
+         ("1", 1, 0, 0, 1, 10)),
+    ],
+    "ReminderService.claim": [
+        (f'UPDATE {REMINDER} SET "claimed_by" = ?, "lease_expires_at" = ? '
+         f'WHERE "id" IN (?,?,?) AND ("claimed_by" IS NULL OR "lease_expires_at" < ?)',
+         ("worker", 0, 1, 2, 3, 0)),
+        (f'SELECT * FROM {REMINDER} WHERE ({REMINDER}."id" IN (?,?,?) '
+         f'AND {REMINDER}."claimed_by" = ? AND {REMINDER}."lease_expires_at" = ?)',
+         (1, 2, 3, "worker", 0)),
+    ],
+    "ReminderService.renew": [
+        (f'UPDATE {REMINDER} SET "lease_expires_at" = ? '
+         f'WHERE "id" IN (?,?,?) AND "claimed_by" = ?', (0, 1, 2, 3, "worker")),
+    ],
+    "ReminderService.release": [
+        (f'UPDATE {REMINDER} SET "claimed_by" = NULL, "lease_expires_at" = NULL '
+         f'WHERE "id" IN (?,?,?) AND "claimed_by" = ?', (1, 2, 3, "worker")),
+    ],
+    # get_all() without filters lists every reminder on purpose and isn't checked.
+}
+
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(?P<table>\w+)")
+
+
+def explain(connection: sqlite3.Connection, sql: str, parameters: tuple) -> list[str]:
+    return [row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+
+def main(database: Path) -> int:
+    if not database.exists():
+        print(f"Database {database} does not exist, run the migrations first")
+        return 2
+
+    connection = sqlite3.connect(database)
+    failed = 0
+
+    for method, statements in QUERIES.items():
+        for sql, parameters in statements:
+            plan = explain(connection, sql, parameters)
+            scans = [line for line in plan if FULL_SCAN.match(line)]
+
+            print(f"{'FAIL' if scans else 'ok':<5}{method}")
+            for line in plan:
+                print(f"       {line}")
+
+            failed += bool(scans)
+
+    connection.close()
+
+    if failed:
+        print(f"\n{failed} queries scan a whole table")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DATABASE))
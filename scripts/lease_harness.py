@@ -0,0 +1,203 @@
+"""
+Runs several delivery workers against the configured SQLite database and
+checks that the lease protocol delivers every reminder.
+
+    python -m scripts.lease_harness --reminders 2000 --workers 4 --per-channel 10
+
+Overdue reminders are created in a throwaway guild with a negative id, which
+no real guild can have, and delivered by worker processes which only have
+the lease sweeper, every send is reported back to the harness. Several
+reminders share each channel, so most of them wait behind the per-channel
+rate limit for longer than a lease. Worker 0 crashes halfway through so its
+leases have to expire and be taken over. Delivery is at-least-once: reminders
+the crashed worker sent but didn't delete yet are sent again, nothing else
+may be.
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import multiprocessing
+import os
+import random
+import time
+
+import disnake
+
+from app import Bot, prisma
+
+
+def throwaway_guild_id() -> int:
+    # discord snowflakes are positive, a negative id never belongs to a real guild
+    return -random.randint(1, 2**31)
+
+
+async def remaining(guild: disnake.Object) -> int:
+    return await prisma.reminder.count(where={"guild_id": guild.snowflake})
+
+
+async def work(
+        worker: int, guild_id: int, results, lease: int, crash_after: int | None
+) -> None:
+    from app.scheduler import DispatchQueue, LeaseSweeper
+    from app.services.ReminderService import ReminderService
+
+    service = ReminderService()
+    service.bot = Bot()
+    guild = disnake.Object(guild_id)
+    sent = 0
+
+    async def send(reminder, _interaction) -> None:
+        nonlocal sent
+        results.put((reminder.id, worker))
+        sent += 1
+
+        if sent == crash_after:
+            os._exit(1)
+
+    await prisma.connect()
+
+    dispatch = DispatchQueue(service, send, rate=10_000, lease=lease, owner=f"worker-{worker}")
+    sweeper = LeaseSweeper(service, dispatch, interval=0.5)
+
+    dispatch.start()
+    sweeper.start()
+
+    try:
+        while await remaining(guild):
+            await asyncio.sleep(0.5)
+    finally:
+        sweeper.stop()
+        dispatch.stop()
+        await prisma.disconnect()
+
+
+def run_worker(
+        worker: int, guild_id: int, results, lease: int, crash_after: int | None
+) -> None:
+    asyncio.run(work(worker, guild_id, results, lease, crash_after))
+
+
+async def seed(guild: disnake.Object, reminders: int, lease: int, per_channel: int) -> None:
+    # overdue by more than a lease, so the sweepers pick them up right away
+    expires_at = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(
+        seconds=lease + 1
+    )
+
+    await prisma.guild.create(data={"snowflake": guild.snowflake, "reminders_count": reminders})
+
+    async with prisma.batch_() as batcher:
+        for number in range(1, reminders + 1):
+            batcher.reminder.create(
+                data={
+                    "content": "lease harness",
+                    "channel_id": number // per_channel + 1,
+                    "author_id": 1,
+                    "expires_at": expires_at,
+                    "reminder_number": number,
+                    "guild_id": guild.snowflake,
+                }
+            )
+
+
+async def cleanup(guild: disnake.Object) -> None:
+    await prisma.reminder.delete_many(where={"guild_id": guild.snowflake})
+    await prisma.guild.delete_many(where={"snowflake": guild.snowflake})
+
+
+def main(reminders: int, workers: int, lease: int, per_channel: int, timeout: float) -> int:
+    guild = disnake.Object(throwaway_guild_id())
+    Bot()  # patches the snowflake property
+
+    async def prepare() -> None:
+        await prisma.connect()
+        # fails instead of touching an existing guild
+        await seed(guild, reminders, lease, per_channel)
+        await prisma.disconnect()
+
+    asyncio.run(prepare())
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(
+                worker,
+                int(guild.id),
+                results,
+                lease,
+                reminders // workers // 2 if worker == 0 else None,
+            ),
+        )
+        for worker in range(workers)
+    ]
+
+    deliveries: collections.Counter = collections.Counter()
+    crashed_deliveries: collections.Counter = collections.Counter()
+    per_worker: collections.Counter = collections.Counter()
+
+    def record(reminder_id: int, worker: int) -> None:
+        deliveries[reminder_id] += 1
+        per_worker[worker] += 1
+
+        if worker == 0:
+            crashed_deliveries[reminder_id] += 1
+
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    deadline = started + timeout
+
+    while time.perf_counter() < deadline and any(process.is_alive() for process in processes):
+        while not results.empty():
+            record(*results.get())
+
+        time.sleep(0.1)
+
+    for process in processes:
+        process.join(timeout=1)
+        if process.is_alive():
+            process.terminate()
+
+    while not results.empty():
+        record(*results.get())
+
+    elapsed = time.perf_counter() - started
+    duplicates = sum(count - 1 for count in deliveries.values())
+    # a reminder sent by the crashed worker may be sent once more by whoever takes it over
+    unexplained = sum(
+        max(0, count - 1 - min(1, crashed_deliveries[reminder_id]))
+        for reminder_id, count in deliveries.items()
+    )
+    missing = reminders - len(deliveries)
+
+    print(f"delivered {len(deliveries)}/{reminders} reminders in {elapsed:.2f}s")
+    for worker in range(workers):
+        note = " (crashed)" if processes[worker].exitcode == 1 else ""
+        print(f"  worker {worker}: {per_worker[worker]} sends{note}")
+    print(f"duplicates: {duplicates} ({unexplained} unexplained), missing: {missing}")
+
+    async def finish() -> None:
+        await prisma.connect()
+        await cleanup(guild)
+        await prisma.disconnect()
+
+    asyncio.run(finish())
+
+    return 1 if missing or unexplained else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reminders", type=int, default=2_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lease", type=int, default=3)
+    parser.add_argument("--per-channel", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    raise SystemExit(
+        main(args.reminders, args.workers, args.lease, args.per_channel, args.timeout)
+    )
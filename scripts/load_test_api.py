@@ -0,0 +1,82 @@
+"""
+Load-tests the bulk reminder endpoints of a running API.
+
+    python -m scripts.load_test_api --guild 123 --requests 200 --batch 100 --concurrency 16
+
+Creates ``requests * batch`` reminders far in the future with up to
+``concurrency`` requests in flight, reports reminders/s and latencies,
+then deletes everything it created.
+"""
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+
+import httpx
+
+
+async def main(
+        base_url: str, guild_id: int, requests: int, batch: int, concurrency: int
+) -> None:
+    expires_at = (
+        datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(days=365)
+    ).isoformat()
+    payload = [
+        {"content": "load test", "channel_id": 1, "author_id": 1, "expires_at": expires_at}
+        for _ in range(batch)
+    ]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+    codes: list[int] = []
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def create() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    f"/api/guilds/{guild_id}/reminders/bulk", json=payload
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+
+            response.raise_for_status()
+            codes.extend(reminder["reminder_number"] for reminder in response.json()["reminders"])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(create() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        print(
+            f"created {len(codes)} reminders in {elapsed:.2f}s, "
+            f"{len(codes) / elapsed:.1f} reminders/s"
+        )
+        print(
+            f"request latency: mean {statistics.mean(timings):.1f} ms, "
+            f"p50 {timings[len(timings) // 2]:.1f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95)]:.1f} ms"
+        )
+
+        started = time.perf_counter()
+        for index in range(0, len(codes), 500):
+            response = await client.request(
+                "DELETE",
+                f"/api/guilds/{guild_id}/reminders",
+                json={"codes": codes[index:index + 500]},
+            )
+            response.raise_for_status()
+
+        print(f"deleted {len(codes)} reminders in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--guild", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.guild, args.requests, args.batch, args.concurrency))
@@ -0,0 +1,90 @@
+import datetime
+import random
+import re
+
+import pytest
+from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta
+
+from app import Settings
+
+DURATION_UNITS = ("y", "M", "w", "d", "h", "m", "s")
+
+
+def legacy_parse_datetime(input_string: str) -> datetime.datetime:
+    """
+    The regex/dateutil parser ``app.timeparse.parse_datetime`` replaced, without its logging.
+    """
+    m = re.match(r"(?:(\d+y)?(\d+M)?(\d+w)?(\d+d)?(\d+h)?(\d+m)?(\d+s)?)", input_string)
+
+    if m and any(item is not None for item in m.groups()):
+        years, months, weeks, days, hours, minutes, seconds = (
+            int(group[:-1]) if group else 0 for group in m.groups()
+        )
+        target_datetime = datetime.datetime.now(tz=Settings.TIMEZONE) + datetime.timedelta(
+            weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds
+        )
+        if years or months:
+            target_datetime = target_datetime + relativedelta(years=years, months=months)
+    elif input_string == "tomorrow":
+        target_datetime = datetime.datetime.now(tz=Settings.TIMEZONE) + datetime.timedelta(days=1)
+    elif input_string == "next week":
+        target_datetime = datetime.datetime.now(tz=Settings.TIMEZONE) + datetime.timedelta(weeks=1)
+    else:
+        target_datetime = parse(input_string)
+
+    return target_datetime
+
+
+def _duration(rng: random.Random) -> str:
+    units = sorted(
+        rng.sample(DURATION_UNITS, rng.choice((1, 1, 1, 2, 2, 3))),
+        key=DURATION_UNITS.index,
+    )
+    return "".join(f"{rng.randint(1, 59)}{unit}" for unit in units)
+
+
+def build_corpus(size: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    """
+    Input shaped like real /reminder create input. Returns the inputs both parsers
+    understand (mostly durations, some day phrases and absolute dates) and the
+    phrases only the new one does.
+    """
+    rng = random.Random(seed)
+    shared = []
+
+    for _ in range(size):
+        roll = rng.random()
+
+        if roll < 0.8:
+            shared.append(_duration(rng))
+        elif roll < 0.9:
+            shared.append(rng.choice(("tomorrow", "next week")))
+        else:
+            day = datetime.date(2030, 1, 1) + datetime.timedelta(days=rng.randint(0, 365))
+            shared.append(f"{day.isoformat()} {rng.randint(0, 23):02}:{rng.randint(0, 59):02}")
+
+    natural = [
+        rng.choice(
+            (
+                f"in {_duration(rng)}",
+                f"in {rng.randint(1, 12)} hours {rng.randint(1, 59)} minutes",
+                f"tomorrow {rng.randint(1, 12)}{rng.choice(('am', 'pm'))}",
+                f"next {rng.choice(('monday', 'friday', 'sunday'))}",
+                f"friday {rng.randint(0, 23):02}:{rng.randint(0, 59):02}",
+            )
+        )
+        for _ in range(size // 10)
+    ]
+
+    return shared, natural
+
+
+@pytest.fixture(scope="session")
+def corpus() -> tuple[list[str], list[str]]:
+    return build_corpus(2_000)
+
+
+@pytest.fixture(scope="session")
+def legacy_parser():
+    return legacy_parse_datetime
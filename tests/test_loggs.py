@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+
+from app.loggs import LazyLogger
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted a record below the logger's level")
+
+    __repr__ = __str__
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def records():
+    handler = Records()
+    wrapped = logging.getLogger("tests.loggs")
+    wrapped.setLevel(logging.INFO)
+    wrapped.propagate = False
+    wrapped.addHandler(handler)
+
+    yield LazyLogger(wrapped), handler.messages
+
+    wrapped.removeHandler(handler)
+
+
+def test_nothing_is_formatted_below_the_level(records):
+    logger, messages = records
+
+    def compute():
+        raise AssertionError("called a lazy argument below the logger's level")
+
+    logger.debug("value %s %r", Unformattable(), Unformattable())
+    logger.debug("value %s", logger.lazy(compute), sample=2, rate=1)
+
+    assert messages == []
+
+
+def test_arguments_are_formatted_when_emitted(records):
+    logger, messages = records
+
+    logger.info("%d reminders", 3)
+    logger.info("computed %s", logger.lazy(lambda: "late"))
+    # classes are plain arguments, not lazy values
+    logger.error("error %r", ValueError)
+
+    assert messages == ["3 reminders", "computed late", "error <class 'ValueError'>"]
+
+
+def test_sampling_reports_suppressed_records(records):
+    logger, messages = records
+
+    for number in range(5):
+        logger.info("tick %d", number, sample=2)
+
+    assert messages == ["tick 0", "tick 2 (1 similar suppressed)", "tick 4 (1 similar suppressed)"]
@@ -0,0 +1,166 @@
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app import Settings
+from app.timeparse import Recurrence, parse_datetime, parse_recurrence
+
+BERLIN = ZoneInfo("Europe/Berlin")
+# clocks go back from 03:00 to 02:00 at 01:00 UTC
+FALL_BACK = datetime.datetime(2026, 10, 25, 1, 30, tzinfo=BERLIN)
+# clocks go forward from 02:00 to 03:00 at 01:00 UTC
+SPRING_FORWARD = datetime.datetime(2026, 3, 29, 1, 30, tzinfo=BERLIN)
+
+
+# a Wednesday
+NOW = datetime.datetime(2030, 1, 2, 12, 0, tzinfo=BERLIN)
+
+
+def elapsed(start: datetime.datetime, end: datetime.datetime) -> datetime.timedelta:
+    return end.astimezone(datetime.timezone.utc) - start.astimezone(datetime.timezone.utc)
+
+
+@pytest.mark.parametrize("now", [FALL_BACK, SPRING_FORWARD])
+@pytest.mark.parametrize(
+    "text, duration",
+    [
+        ("2h", datetime.timedelta(hours=2)),
+        ("90m", datetime.timedelta(minutes=90)),
+        ("in 2 hours", datetime.timedelta(hours=2)),
+        ("1d", datetime.timedelta(days=1)),
+        ("every 2h", datetime.timedelta(hours=2)),
+    ],
+)
+def test_durations_are_elapsed_time_across_dst(now, text, duration):
+    assert elapsed(now, parse_datetime(text, BERLIN, now)) == duration
+
+
+@pytest.mark.parametrize("now", [FALL_BACK, SPRING_FORWARD])
+def test_day_phrases_keep_the_wall_clock_across_dst(now):
+    target = parse_datetime("tomorrow 9am", BERLIN, now)
+
+    assert (target.date(), target.hour, target.minute) == (now.date() + datetime.timedelta(1), 9, 0)
+
+
+def test_hourly_recurrence_doesnt_drift_across_dst():
+    recurrence = Recurrence.from_rule("2h")
+    occurrence = FALL_BACK
+
+    for _ in range(3):
+        following = recurrence.next_after(occurrence, occurrence, BERLIN)
+        assert elapsed(occurrence, following) == datetime.timedelta(hours=2)
+        occurrence = following
+
+
+def test_daily_recurrence_keeps_the_wall_clock_across_dst():
+    start = datetime.datetime(2026, 10, 24, 9, tzinfo=BERLIN)
+    following = Recurrence.from_rule("1d").next_after(start, start, BERLIN)
+
+    assert following == datetime.datetime(2026, 10, 25, 9, tzinfo=BERLIN)
+    assert elapsed(start, following) == datetime.timedelta(hours=25)
+
+
+def test_agrees_with_the_legacy_parser(corpus, legacy_parser):
+    shared, _ = corpus
+    mismatches = []
+
+    for text in shared:
+        legacy = legacy_parser(text)
+
+        if legacy.tzinfo is None:
+            legacy = legacy.replace(tzinfo=Settings.TIMEZONE)
+
+        if abs(parse_datetime(text) - legacy) > datetime.timedelta(seconds=1):
+            mismatches.append(text)
+
+    assert mismatches == []
+
+
+def test_natural_phrases_are_in_the_future(corpus):
+    _, natural = corpus
+    now = datetime.datetime.now(tz=Settings.TIMEZONE)
+
+    for text in natural:
+        target = parse_datetime(text, now=now)
+        assert target.tzinfo is not None and target > now, text
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2h30m", datetime.datetime(2030, 1, 2, 14, 30)),
+        ("in 3 days", datetime.datetime(2030, 1, 5, 12, 0)),
+        ("1M", datetime.datetime(2030, 2, 2, 12, 0)),
+        ("tomorrow 9am", datetime.datetime(2030, 1, 3, 9, 0)),
+        ("noon", datetime.datetime(2030, 1, 3, 12, 0)),
+        ("18:30", datetime.datetime(2030, 1, 2, 18, 30)),
+        ("8am", datetime.datetime(2030, 1, 3, 8, 0)),
+        # a bare weekday is today while its time hasn't passed
+        ("wednesday 18:00", datetime.datetime(2030, 1, 2, 18, 0)),
+        ("wednesday 9am", datetime.datetime(2030, 1, 9, 9, 0)),
+        ("friday", datetime.datetime(2030, 1, 4, 12, 0)),
+        ("next wednesday", datetime.datetime(2030, 1, 9, 12, 0)),
+        ("next friday 18:30", datetime.datetime(2030, 1, 4, 18, 30)),
+        ("next week", datetime.datetime(2030, 1, 9, 12, 0)),
+    ],
+)
+def test_parses_relative_phrases(text, expected):
+    assert parse_datetime(text, BERLIN, NOW) == expected.replace(tzinfo=BERLIN)
+
+
+def test_unknown_input_raises():
+    with pytest.raises(ValueError):
+        parse_datetime("whenever", BERLIN, NOW)
+
+
+@pytest.mark.parametrize(
+    "text, rule",
+    [
+        ("every 1d", "1d"),
+        ("every day 9am", "1d"),
+        ("every monday", "1w"),
+        ("every 2 hours 30 minutes", "2h30m"),
+        ("tomorrow", None),
+    ],
+)
+def test_parses_recurrences(text, rule):
+    recurrence = parse_recurrence(text)
+    assert (str(recurrence) if recurrence else None) == rule
+
+
+@pytest.mark.parametrize("text", ["every 30s", "every sometimes"])
+def test_rejects_invalid_recurrences(text):
+    with pytest.raises(ValueError):
+        parse_recurrence(text)
+
+
+def test_every_day_starts_at_the_next_time_of_day():
+    assert parse_datetime("every day 9am", BERLIN, NOW) == datetime.datetime(
+        2030, 1, 3, 9, tzinfo=BERLIN
+    )
+
+
+def test_monthly_recurrence_keeps_the_day_of_its_anchor():
+    anchor = datetime.datetime(2030, 1, 31, 9, tzinfo=BERLIN)
+    recurrence = Recurrence.from_rule("1M")
+    occurrence = anchor
+    days = []
+
+    for _ in range(4):
+        occurrence = recurrence.next_after(occurrence, occurrence, BERLIN, anchor=anchor)
+        days.append(occurrence.date())
+
+    assert days == [
+        datetime.date(2030, 2, 28),
+        datetime.date(2030, 3, 31),
+        datetime.date(2030, 4, 30),
+        datetime.date(2030, 5, 31),
+    ]
+
+
+def test_recurrence_skips_missed_occurrences():
+    previous = datetime.datetime(2030, 1, 1, 9, tzinfo=BERLIN)
+    following = Recurrence.from_rule("1d").next_after(previous, NOW, BERLIN)
+
+    assert following == datetime.datetime(2030, 1, 3, 9, tzinfo=BERLIN)
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.timeparse import parse_datetime  # noqa: E402
+
+
+def parse_all(parser, inputs: list[str]) -> None:
+    for text in inputs:
+        parser(text)
+
+
+@pytest.mark.benchmark(group="parse_datetime")
+def test_legacy(benchmark, corpus, legacy_parser):
+    shared, _ = corpus
+    benchmark(parse_all, legacy_parser, shared)
+
+
+@pytest.mark.benchmark(group="parse_datetime")
+def test_parse_datetime(benchmark, corpus):
+    shared, _ = corpus
+    benchmark(parse_all, parse_datetime, shared)
+
+
+@pytest.mark.benchmark(group="parse_datetime")
+def test_parse_datetime_natural(benchmark, corpus):
+    _, natural = corpus
+    benchmark(parse_all, parse_datetime, natural)